@@ -7,11 +7,18 @@ Create a unified CSV combining templates from all platforms (Zapier, Make, n8n)
 - Sorts by platform and popularity
 - Generates summary statistics
 """
-import csv
+import argparse
 import os
+from collections import defaultdict
 from datetime import datetime
-from collections import Counter
 import logging
+import sys
+import traceback
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
 # Setup logging
 logging.basicConfig(
@@ -19,107 +26,116 @@ logging.basicConfig(
     format='[%(levelname)s] %(message)s'
 )
 
+# Fields every template row must have
+REQUIRED_FIELDS = ('platform', 'platform_id', 'name', 'url')
+
+# Low-cardinality columns, stored as categories so comparisons run on the codes
+CATEGORY_COLUMNS = ('platform', 'status', 'is_public', 'creator_verified')
+
 
-def load_csv(filepath):
-    """Load CSV file and return rows"""
+def load_csv(filepath, columns=None):
+    """Load CSV file into a DataFrame of string columns, optionally only those in columns"""
     if not os.path.exists(filepath):
         logging.warning(f"File not found: {filepath}")
-        return []
+        return pd.DataFrame()
 
-    rows = []
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-        logging.info(f"Loaded {len(rows):,} rows from {os.path.basename(filepath)}")
-        return rows
+        # Keep every field as text (empty fields stay '') so values round-trip unchanged
+        dtype = defaultdict(lambda: str, {col: 'category' for col in CATEGORY_COLUMNS})
+        # Columns missing from the file are left out rather than raising, so check_schema can report them
+        usecols = None if columns is None else (lambda col: col in columns)
+        df = pd.read_csv(filepath, dtype=dtype, usecols=usecols, keep_default_na=False, encoding='utf-8')
+        if columns is None:
+            logging.info(f"Loaded {len(df):,} rows from {os.path.basename(filepath)}")
+        return df
     except Exception as e:
         logging.error(f"Error loading {filepath}: {e}")
+        return pd.DataFrame()
+
+
+def read_fieldnames(filepath):
+    """Read the header of a CSV file"""
+    if not os.path.exists(filepath):
         return []
+    return list(pd.read_csv(filepath, nrows=0, encoding='utf-8').columns)
 
 
-def validate_row(row, platform):
-    """Validate that a row has minimum required fields"""
-    required_fields = ['platform', 'platform_id', 'name', 'url']
+def check_schema(columns, platform, filepath):
+    """Check once per file that a platform CSV can be used without row validation"""
+    filename = os.path.basename(filepath)
 
-    for field in required_fields:
-        if not row.get(field):
-            return False
+    missing = [field for field in REQUIRED_FIELDS if field not in columns]
+    if missing:
+        logging.error(f"   {filename} is missing required columns: {', '.join(missing)}")
+        return False
 
-    # Check platform matches
-    if row.get('platform') != platform:
+    # Scrapers write one file per platform, named after it
+    if not filename.startswith(f"{platform}_"):
+        logging.error(f"   {filename} does not look like a {platform} export")
         return False
 
     return True
 
 
-def get_sort_key(row):
-    """Generate sort key for templates"""
-    platform = row.get('platform', 'zzz')
+def validate_rows(df, platform):
+    """Get a mask of the rows that have minimum required fields"""
+    if not set(REQUIRED_FIELDS).issubset(df.columns):
+        return pd.Series(False, index=df.index)
 
-    # Get popularity metric (use views, usage_count, or 0)
-    try:
-        views = int(row.get('total_views') or 0)
-    except:
-        views = 0
+    mask = df[list(REQUIRED_FIELDS)].ne('').all(axis=1)
 
-    try:
-        usage = int(row.get('usage_count') or 0)
-    except:
-        usage = 0
+    # Check platform matches
+    return mask & df['platform'].eq(platform)
 
-    popularity = max(views, usage)
 
-    # Sort by platform (alphabetically), then by popularity (descending)
-    return (platform, -popularity)
+def get_popularity(df):
+    """Get popularity metric for each template (views or usage_count, whichever is larger)"""
+    # Missing or non-numeric counts count as 0
+    views = pd.to_numeric(df['total_views'], errors='coerce').fillna(0)
+    usage = pd.to_numeric(df['usage_count'], errors='coerce').fillna(0)
+    return np.maximum(views, usage).astype(np.int64)
 
 
-def generate_statistics(all_rows):
+def generate_statistics(df):
     """Generate statistics about the unified dataset"""
-    stats = {
-        'total_templates': len(all_rows),
-        'by_platform': Counter(),
-        'by_status': Counter(),
-        'top_apps': Counter(),
-        'with_creator': 0,
-        'with_views': 0,
-        'with_usage': 0,
-        'public_templates': 0,
-        'verified_creators': 0
-    }
-
-    for row in all_rows:
-        platform = row.get('platform', 'unknown')
-        stats['by_platform'][platform] += 1
-
-        status = row.get('status', 'unknown')
-        stats['by_status'][status] += 1
+    # Split by comma or semicolon
+    apps = (
+        df['apps_used'].str.replace(';', ',', regex=False)
+        .str.split(',').explode().str.strip()
+    )
+    apps = apps[apps != '']
 
+    stats = {
+        'total_templates': len(df),
+        # Categories with no rows left after validation are not reported
+        'by_platform': df['platform'].value_counts().loc[lambda counts: counts > 0],
+        'by_status': df['status'].value_counts().loc[lambda counts: counts > 0],
+        # Limit to first 10 apps per template
+        'top_apps': apps.groupby(level=0).head(10).value_counts(),
         # Count templates with various metrics
-        if row.get('creator_name'):
-            stats['with_creator'] += 1
+        'with_creator': df['creator_name'].ne('').sum(),
+        'with_views': df['total_views'].ne('').sum(),
+        'with_usage': df['usage_count'].ne('').sum(),
+        'public_templates': df['is_public'].eq('True').sum(),
+        'verified_creators': df['creator_verified'].eq('True').sum()
+    }
 
-        if row.get('total_views') and row.get('total_views') != '':
-            stats['with_views'] += 1
+    return stats
 
-        if row.get('usage_count') and row.get('usage_count') != '':
-            stats['with_usage'] += 1
 
-        if row.get('is_public') == 'True':
-            stats['public_templates'] += 1
+def combine_statistics(stats_list):
+    """Combine statistics generated separately for consecutive chunks of the dataset"""
+    def combine_counts(key):
+        # Keep first-seen order for ties, as if counted over the whole dataset
+        counts = pd.concat([stats[key] for stats in stats_list]).groupby(level=0, sort=False).sum()
+        return counts.sort_values(ascending=False, kind='stable')
 
-        if row.get('creator_verified') == 'True':
-            stats['verified_creators'] += 1
+    combined = {key: combine_counts(key) for key in ('by_platform', 'by_status', 'top_apps')}
+    for key in ('total_templates', 'with_creator', 'with_views', 'with_usage',
+                'public_templates', 'verified_creators'):
+        combined[key] = sum(stats[key] for stats in stats_list)
 
-        # Count apps used
-        apps = row.get('apps_used', '')
-        if apps:
-            # Split by comma or semicolon
-            app_list = [a.strip() for a in apps.replace(';', ',').split(',') if a.strip()]
-            for app in app_list[:10]:  # Limit to first 10 apps per template
-                stats['top_apps'][app] += 1
-
-    return stats
+    return combined
 
 
 def print_statistics(stats):
@@ -153,12 +169,13 @@ def print_statistics(stats):
     print()
 
     print("🔥 Top 20 Most Used Apps/Nodes:")
-    for i, (app, count) in enumerate(stats['top_apps'].most_common(20), 1):
+    for i, (app, count) in enumerate(stats['top_apps'].head(20).items(), 1):
         print(f"   {i:2d}. {app}: {count:,} templates")
     print()
 
 
-def main():
+def main(strict=False):
+    """Create the unified CSV; strict re-validates every row, not just each file's header"""
     # Print banner
     logging.info("=" * 80)
     logging.info("  CREATING UNIFIED CSV FROM ALL PLATFORMS")
@@ -172,77 +189,98 @@ def main():
         'n8n': './exports/n8n_templates_20251028_104701_2025-10-28_10-47-01.csv'
     }
 
-    # Load all data
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = f'./exports/unified_templates_{timestamp}.csv'
+    # Written under a temporary name and renamed once complete, so a failed run leaves no partial file
+    temp_file = f'{output_file}.tmp'
+
+    # Output has the union of all input columns
+    fieldnames = []
+    for filepath in input_files.values():
+        fieldnames.extend(col for col in read_fieldnames(filepath) if col not in fieldnames)
+    schema = pa.schema([(col, pa.string()) for col in fieldnames])
+
+    # Ids are claimed in input_files order, so when platforms share a platform_id
+    # the earlier platform's row is kept. This pass reads only the required columns
     logging.info("📥 Loading CSV files...")
-    all_rows = []
+    seen_ids = np.array([], dtype=np.uint64)
+    keep_rows = {}
     platform_counts = {}
+    duplicates = 0
 
     for platform, filepath in input_files.items():
-        rows = load_csv(filepath)
+        df = load_csv(filepath, columns=REQUIRED_FIELDS)
+        # Missing or unreadable files are skipped
+        if df.empty or not check_schema(df.columns, platform, filepath):
+            platform_counts[platform] = 0
+            continue
 
-        # Validate rows
-        valid_rows = [row for row in rows if validate_row(row, platform)]
-        invalid_count = len(rows) - len(valid_rows)
+        valid = np.ones(len(df), dtype=bool)
+        if strict:
+            # Validate rows
+            valid = validate_rows(df, platform).to_numpy()
+            invalid_count = len(df) - valid.sum()
 
-        if invalid_count > 0:
-            logging.warning(f"   Skipped {invalid_count} invalid rows from {platform}")
+            if invalid_count > 0:
+                logging.warning(f"   Skipped {invalid_count} invalid rows from {platform}")
 
-        all_rows.extend(valid_rows)
-        platform_counts[platform] = len(valid_rows)
+        platform_counts[platform] = valid.sum()
 
-    if not all_rows:
-        logging.error("❌ No data to process!")
-        return 1
+        # Remove duplicates based on platform_id, including ids claimed by an earlier platform.
+        # Ids are compared as 64-bit hashes, which are much smaller than the strings
+        rows = np.flatnonzero(valid)
+        id_hashes = pd.util.hash_array(df['platform_id'].to_numpy(dtype=object)[rows])
+        unique = ~np.isin(id_hashes, seen_ids) & ~pd.Series(id_hashes).duplicated().to_numpy()
+        duplicates += len(rows) - unique.sum()
+        keep_rows[platform] = rows[unique]
+        seen_ids = np.concatenate([seen_ids, id_hashes[unique]])
 
-    logging.info(f"✅ Loaded {len(all_rows):,} total templates")
-    logging.info("")
+    # Platforms are written one at a time in output (alphabetical) order, so
+    # only one platform's rows are in memory at once
+    logging.info("💾 Writing unified CSV...")
+    platform_stats = []
 
-    # Remove duplicates based on platform_id
-    logging.info("🔍 Checking for duplicates...")
-    seen_ids = set()
-    unique_rows = []
-    duplicates = 0
+    try:
+        # Arrow formats and writes the CSV in large batches
+        with pacsv.CSVWriter(temp_file, schema, write_options=pacsv.WriteOptions(batch_size=8192)) as csv_writer:
+            for platform in sorted(keep_rows):
+                if not len(keep_rows[platform]):
+                    continue
+                df = load_csv(input_files[platform]).iloc[keep_rows[platform]]
 
-    for row in all_rows:
-        platform_id = row.get('platform_id')
-        if platform_id in seen_ids:
-            duplicates += 1
-            continue
-        seen_ids.add(platform_id)
-        unique_rows.append(row)
+                # Sort by popularity (descending), keeping file order for ties
+                df = (
+                    df.reindex(columns=fieldnames, fill_value='')
+                    .assign(_popularity=get_popularity(df))
+                    .sort_values('_popularity', ascending=False, kind='stable')
+                    .drop(columns='_popularity')
+                )
 
-    if duplicates > 0:
-        logging.warning(f"   Removed {duplicates} duplicate templates")
-    else:
-        logging.info("   No duplicates found")
+                csv_writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
 
-    all_rows = unique_rows
-    logging.info("")
+                platform_stats.append(generate_statistics(df))
 
-    # Sort by platform and popularity
-    logging.info("🔄 Sorting templates...")
-    all_rows.sort(key=get_sort_key)
-    logging.info("   Sorted by platform and popularity (views/usage)")
-    logging.info("")
+        if not platform_stats:
+            logging.error("❌ No data to process!")
+            return 1
 
-    # Generate statistics
-    logging.info("📊 Generating statistics...")
-    stats = generate_statistics(all_rows)
-    print_statistics(stats)
+        os.replace(temp_file, output_file)
 
-    # Write unified CSV
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = f'./exports/unified_templates_{timestamp}.csv'
+        stats = combine_statistics(platform_stats)
 
-    logging.info("💾 Writing unified CSV...")
+        logging.info(f"✅ Loaded {stats['total_templates'] + duplicates:,} total templates")
+        logging.info("")
 
-    try:
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            if all_rows:
-                fieldnames = list(all_rows[0].keys())
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(all_rows)
+        if duplicates > 0:
+            logging.warning(f"   Removed {duplicates} duplicate templates")
+        else:
+            logging.info("   No duplicates found")
+        logging.info("   Sorted by platform and popularity (views/usage)")
+        logging.info("")
+
+        # Generate statistics
+        logging.info("📊 Generating statistics...")
+        print_statistics(stats)
 
         file_size = os.path.getsize(output_file)
         file_size_mb = file_size / (1024 * 1024)
@@ -250,7 +288,7 @@ def main():
         logging.info(f"✅ Unified CSV created successfully!")
         logging.info(f"   File: {output_file}")
         logging.info(f"   Size: {file_size_mb:.2f} MB")
-        logging.info(f"   Templates: {len(all_rows):,}")
+        logging.info(f"   Templates: {stats['total_templates']:,}")
         logging.info("")
 
         # Summary by platform
@@ -267,11 +305,18 @@ def main():
 
     except Exception as e:
         logging.error(f"❌ Error writing unified CSV: {e}")
-        import traceback
         traceback.print_exc()
         return 1
 
+    finally:
+        # On failure, drop the partly written output; after the rename there is nothing to remove
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
 
 if __name__ == "__main__":
-    import sys
-    sys.exit(main())
+    parser = argparse.ArgumentParser(description="Create a unified CSV from all platform exports")
+    parser.add_argument('--strict', action='store_true',
+                        help="validate every row, not just each file's header")
+    args = parser.parse_args()
+    sys.exit(main(strict=args.strict))
@@ -5,14 +5,19 @@ Comprehensive Streamlit dashboard for analyzing 15K+ automation templates
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import json
-from collections import Counter
-import glob
+import csv
+import io
+import re
 import os
 
+from tag_fields import encode_tag_columns
+
 # Page configuration
 st.set_page_config(
     page_title="Template Harvester Dashboard",
@@ -55,59 +60,268 @@ st.markdown("""
 # DATA LOADING
 # ============================================================================
 
-@st.cache_data
+BOOL_COLUMNS = [
+    'requires_coding', 'requires_api_keys', 'is_ai_powered',
+    'is_webhook_based', 'is_scheduled', 'is_realtime',
+    'has_conditional_logic', 'has_loops', 'uses_llm',
+    'uses_embeddings', 'uses_vision', 'uses_voice', 'has_memory',
+    'uses_spreadsheet', 'uses_email', 'uses_storage',
+    'uses_communication', 'uses_crm', 'uses_social_media',
+    'uses_ecommerce', 'uses_project_mgmt', 'uses_forms', 'has_rag'
+]
+
+NUMERIC_COLUMNS = {
+    'app_count': 'int64',
+    'node_count': 'int64',
+    'engagement_score': 'int64',
+    'popularity': 'int64',
+    # Views and usage are only reported by some platforms
+    'total_views': 'float64',
+    'usage_count': 'float64'
+}
+
+# Low-cardinality text columns, stored as categories for faster filters and group-bys
+CATEGORY_COLUMNS = [
+    'platform', 'automation_type', 'complexity_level', 'popularity_tier',
+    'primary_industry', 'estimated_setup_time', 'estimated_time_saved',
+    'integration_pattern', 'ai_provider', 'ai_use_case'
+]
+
+# Free-text columns, stored as Arrow strings so .str methods run in Arrow's kernels
+TEXT_COLUMNS = ['name', 'description', 'apps_used', 'url']
+
+COLUMN_TYPES = {
+    **{col: pa.bool_() for col in BOOL_COLUMNS},
+    **{col: pa.from_numpy_dtype(np.dtype(dtype)) for col, dtype in NUMERIC_COLUMNS.items()}
+}
+
+# Flag spellings pyarrow's typed read accepts
+BOOL_VALUES = {'true': True, '1': True, 'false': False, '0': False}
+
+
+def read_csv_arrow(filepath):
+    """Read CSV with pyarrow's multi-threaded parser"""
+    with open(filepath, newline='', encoding='utf-8') as f:
+        header = next(csv.reader(f))
+
+    def read(column_types):
+        return pacsv.read_csv(
+            filepath,
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=pacsv.ConvertOptions(column_types=column_types, strings_can_be_null=True)
+        ).to_pandas()
+
+    # Columns without a known type stay text, so type inference on the first
+    # block can't fail on a later block
+    try:
+        return read({col: COLUMN_TYPES.get(col, pa.string()) for col in header})
+    except pa.ArrowInvalid:
+        pass
+
+    # A malformed count or flag (e.g. "1,234" or "N/A") fails the typed read, so
+    # read everything as text and turn values that don't parse into missing ones
+    df = read({col: pa.string() for col in header})
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    for col in BOOL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].str.lower().map(BOOL_VALUES)
+    return df
+
+
+# Above this many templates the Analytics scatter plots aggregated points
+SCATTER_POINT_LIMIT = 5000
+
+# Overview technology flags and their display labels
+TECH_FLAGS = {
+    'is_ai_powered': 'AI-Powered',
+    'is_webhook_based': 'Webhook-Based',
+    'is_scheduled': 'Scheduled',
+    'has_conditional_logic': 'Conditional Logic',
+    'has_loops': 'Has Loops',
+    'uses_llm': 'Uses LLM'
+}
+
+# AI Insights feature flags and their display labels
+AI_FEATURES = {
+    'uses_llm': 'Uses LLM',
+    'uses_embeddings': 'Uses Embeddings',
+    'uses_vision': 'Uses Vision',
+    'uses_voice': 'Uses Voice',
+    'has_memory': 'Has Memory',
+    'has_rag': 'Has RAG'
+}
+
+# App Analysis category flags and their display labels
+APP_CATEGORIES = {
+    'uses_spreadsheet': 'Spreadsheet',
+    'uses_email': 'Email',
+    'uses_storage': 'Storage',
+    'uses_communication': 'Communication',
+    'uses_crm': 'CRM',
+    'uses_social_media': 'Social Media',
+    'uses_ecommerce': 'E-commerce',
+    'uses_project_mgmt': 'Project Mgmt',
+    'uses_forms': 'Forms'
+}
+
+# Every column a sidebar filter can act on; the Overview cube is grouped by these
+CUBE_DIMENSIONS = [
+    'platform', 'automation_type', 'complexity_level', 'popularity_tier',
+    'is_ai_powered', 'app_count'
+]
+
+# Columns the tabs filter, aggregate or tabulate. The tabs get only these;
+# template details and comparisons read the full row from the loaded data
+USED_COLUMNS = [
+    'name', 'url', 'platform', 'platform_id', 'automation_type',
+    'complexity_level', 'popularity_tier', 'primary_industry',
+    'estimated_setup_time', 'estimated_time_saved', 'integration_pattern',
+    'ai_provider', 'ai_use_case', 'app_count', 'engagement_score',
+    'apps_used', '_search_blob', 'requires_coding', 'is_ai_powered',
+    'uses_llm', 'uses_embeddings', 'uses_vision', 'uses_voice',
+    'has_memory', 'has_rag', 'uses_spreadsheet', 'uses_email',
+    'uses_storage', 'uses_communication', 'uses_crm', 'uses_social_media',
+    'uses_ecommerce', 'uses_project_mgmt', 'uses_forms'
+]
+
+# Templates offered in each Comparison selector
+COMPARISON_NAME_LIMIT = 5000
+
+# Rows per page in the Explorer table
+EXPLORER_PAGE_SIZE = 500
+
+# Export files in order of preference: (prefix, suffix, description)
+EXPORT_SOURCES = [
+    # Parquet keeps column types, so nothing needs to be re-parsed from text
+    ('unified_templates_enriched_', '.parquet', 'enriched (parquet)'),
+    # Sanitized lite version (optimized for Streamlit)
+    ('unified_templates_lite_', '_sanitized.csv', 'lite (sanitized)'),
+    ('unified_templates_lite_', '.csv', 'lite'),
+    ('unified_templates_enriched_', '.csv', 'enriched')
+]
+
+
+def find_latest_export(exports_dir='./exports'):
+    """Find the most recently modified export of the most preferred kind"""
+    try:
+        with os.scandir(exports_dir) as entries:
+            files = [entry for entry in entries if entry.is_file()]
+    except FileNotFoundError:
+        return None, None
+
+    for prefix, suffix, file_type in EXPORT_SOURCES:
+        matches = [f for f in files if f.name.startswith(prefix) and f.name.endswith(suffix)]
+        if matches:
+            latest = max(matches, key=lambda f: f.stat().st_mtime)
+            return latest.path, file_type
+
+    return None, None
+
+
+@st.cache_data(show_spinner=False)
 def load_data():
-    """Load enriched CSV data"""
-    # First try to find sanitized lite version (optimized for Streamlit)
-    sanitized_files = glob.glob('./exports/unified_templates_lite_*_sanitized.csv')
-    lite_files = glob.glob('./exports/unified_templates_lite_*.csv')
-    enriched_files = glob.glob('./exports/unified_templates_enriched_*.csv')
-
-    if sanitized_files:
-        latest_file = max(sanitized_files)
-        file_type = "lite (sanitized)"
-    elif lite_files:
-        latest_file = max(lite_files)
-        file_type = "lite"
-    elif enriched_files:
-        latest_file = max(enriched_files)
-        file_type = "enriched"
-    else:
+    """Load enriched data, preferring the Parquet export over CSV"""
+    latest_file, file_type = find_latest_export()
+
+    if latest_file is None:
         st.error("No enriched CSV files found! Please run enrich_unified_csv.py first.")
         st.stop()
 
     # Load data
     st.info(f"📁 Loading {file_type} version: {os.path.basename(latest_file)}")
-    df = pd.read_csv(latest_file, low_memory=False)
-
-    # Convert boolean columns
-    bool_columns = [
-        'requires_coding', 'requires_api_keys', 'is_ai_powered',
-        'is_webhook_based', 'is_scheduled', 'is_realtime',
-        'has_conditional_logic', 'has_loops', 'uses_llm',
-        'uses_embeddings', 'uses_vision', 'uses_voice', 'has_memory',
-        'uses_spreadsheet', 'uses_email', 'uses_storage',
-        'uses_communication', 'uses_crm', 'uses_social_media',
-        'uses_ecommerce', 'uses_project_mgmt', 'uses_forms', 'has_rag'
-    ]
+    if latest_file.endswith('.parquet'):
+        df = pd.read_parquet(latest_file)
+    else:
+        # Parse boolean and numeric columns while reading rather than converting afterwards
+        df = read_csv_arrow(latest_file)
+
+    # Missing flags count as False
+    bool_columns = [col for col in BOOL_COLUMNS if col in df.columns]
+    df[bool_columns] = df[bool_columns].fillna(False).astype(bool)
+
+    text_columns = [col for col in TEXT_COLUMNS if col in df.columns]
+    df[text_columns] = df[text_columns].astype('string[pyarrow]')
+
+    category_columns = [col for col in CATEGORY_COLUMNS if col in df.columns]
+    df[category_columns] = df[category_columns].astype('category')
+    if latest_file.endswith('.parquet'):
+        # Parquet exports carry the enrichment's full category lists; keep the
+        # values present, sorted, as astype('category') gives for CSV text
+        for col in category_columns:
+            present = df[col].cat.remove_unused_categories().cat.categories
+            df[col] = df[col].cat.set_categories(present.sort_values(), ordered=False)
+    df['app_count'] = df['app_count'].fillna(0).astype('int16')
+
+    # Newer enrichment exports leave out columns derivable from others
+    if 'requires_api_keys' not in df.columns:
+        df['requires_api_keys'] = df['app_count'] > 0
+    if 'popularity' not in df.columns and {'total_views', 'usage_count'} <= set(df.columns):
+        views = pd.to_numeric(df['total_views'], errors='coerce')
+        usage = pd.to_numeric(df['usage_count'], errors='coerce')
+        df['popularity'] = np.fmax(views, usage).fillna(0).astype('int64')
+
+    # Lowercased search text, built once instead of lowercasing three columns on
+    # every search. Fields are joined with a separator no search term contains
+    df['_search_blob'] = (
+        df['name'].fillna('') + '\x1f' +
+        df['description'].fillna('') + '\x1f' +
+        df['apps_used'].fillna('')
+    ).str.lower()
 
-    for col in bool_columns:
-        if col in df.columns:
-            df[col] = df[col].map({'True': True, 'False': False, True: True, False: False})
+    return df, latest_file
 
-    # Convert numeric columns
-    numeric_columns = ['app_count', 'node_count', 'engagement_score', 'total_views', 'usage_count']
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
 
-    return df, latest_file
+@st.cache_data(show_spinner=False)
+def get_filter_options(_df, data_file):
+    """Get sidebar option lists once per data file instead of scanning on every rerun"""
+    return {
+        'platforms': _df['platform'].cat.categories.tolist(),
+        'automation_types': sorted(_df['automation_type'].cat.categories.tolist()),
+        'app_min': int(_df['app_count'].min()),
+        'app_max': int(_df['app_count'].max())
+    }
+
+
+@st.cache_data(show_spinner=False)
+def get_template_index(_df, data_file):
+    """Map each template's (platform, platform_id) key to its row label.
+
+    Names are not unique, but the unified CSV keeps one row per platform id
+    """
+    return dict(zip(zip(_df['platform'], _df['platform_id']), _df.index))
+
+
+@st.cache_data(show_spinner=False)
+def get_overview_cube(_df, data_file):
+    """Roll the Overview metrics up by every sidebar filter dimension.
+
+    Filtering the cube with the sidebar filters gives the same totals as
+    filtering the rows, but only touches one row per combination of filter
+    values. first_row keeps the file order for breaking ties.
+    """
+    # Flags that are also dimensions are counted from their templates instead
+    flags = [col for col in TECH_FLAGS if col in _df.columns and col not in CUBE_DIMENSIONS]
+    cube = _df.assign(_row=np.arange(len(_df))).groupby(
+        CUBE_DIMENSIONS, observed=True, dropna=False
+    ).agg(
+        templates=('platform_id', 'size'),
+        app_sum=('app_count', 'sum'),
+        first_row=('_row', 'min'),
+        **{col: (col, 'sum') for col in flags}
+    )
+    return cube.reset_index()
 
 
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
 
+# apps_used lists are separated by commas or semicolons
+APP_SEPARATOR = re.compile(r'[;,]')
+
+
 def create_metric_card(title, value, delta=None):
     """Create a metric display card"""
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -115,853 +329,1027 @@ def create_metric_card(title, value, delta=None):
         st.metric(label=title, value=value, delta=delta)
 
 
-def parse_json_field(value):
-    """Parse JSON field safely"""
-    if pd.isna(value) or value == '' or value is None:
-        return []
-    try:
-        return json.loads(value)
-    except:
-        return []
+def count_values(series):
+    """Count values, most frequent first and ties in order of first appearance"""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.value_counts()
+
+    # Count the integer codes so unused categories are left out and ties
+    # aren't reordered by category
+    codes = pd.Series(series.cat.codes.to_numpy())
+    counts = codes[codes >= 0].value_counts()
+    index = pd.CategoricalIndex(series.cat.categories[counts.index], name=series.name)
+    return pd.Series(counts.to_numpy(), index=index, name='count')
+
+
+def count_in_order(series, order):
+    """Count the values in order, with 0 for values that don't occur"""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.value_counts().reindex(order, fill_value=0)
+
+    # One bincount over the integer codes; missing values (-1) are dropped
+    codes = series.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+    return pd.Series(counts, index=series.cat.categories).reindex(order, fill_value=0)
+
+
+@st.cache_data(show_spinner=False)
+def count_top_apps(apps_used, n):
+    """Count the n most used apps, counting the first 10 apps of each template"""
+    apps = apps_used.dropna().str.split(APP_SEPARATOR).explode().str.strip()
+    apps = apps[apps != '']
+    return apps.groupby(level=0).head(10).value_counts().head(n)
+
+
+def rollup_counts(cube, column):
+    """Total cube counts by column, most frequent first and ties in order of first appearance"""
+    totals = cube.groupby(column, observed=True).agg(
+        templates=('templates', 'sum'),
+        first_row=('first_row', 'min')
+    )
+    totals = totals.sort_values(['templates', 'first_row'], ascending=[False, True])
+    return totals['templates']
+
+
+def count_flags(df, flags):
+    """Count each flag column's True values in one reduction, by display label.
+
+    Flags missing from df count as 0
+    """
+    sums = df[[col for col in flags if col in df.columns]].sum()
+    return {label: sums.get(col, 0) for col, label in flags.items()}
+
+
+def category_mask(series, values):
+    """Boolean array of the rows whose value is in values"""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.isin(values).to_numpy()
+
+    # Compare the integer codes instead of the labels; values that aren't
+    # categories get -1 and are dropped so they can't match missing values
+    codes = series.cat.categories.get_indexer(values)
+    return np.isin(series.cat.codes.to_numpy(), codes[codes >= 0])
+
+
+# Option lists depend on the rows' order and on these columns only, so the
+# cache hashes just them rather than the whole frame
+OPTION_COLUMNS = ['platform', 'platform_id', 'name', 'engagement_score']
+
+
+@st.cache_data(show_spinner=False, hash_funcs={
+    pd.DataFrame: lambda df: pd.util.hash_pandas_object(df[OPTION_COLUMNS], index=False).to_numpy().tobytes()
+})
+def template_options(df, limit=None):
+    """Selector options mapping (platform, platform_id) keys to template names,
+    the most engaging first if there are more than limit
+    """
+    if limit is not None and len(df) > limit:
+        df = df.nlargest(limit, 'engagement_score')
+    return dict(zip(zip(df['platform'], df['platform_id']), df['name']))
+
+
+def find_template(df, template_index, key, full_df=None):
+    """Get the row of df with the given (platform, platform_id) key, or None.
+
+    If full_df is given, the row is read from it so it has every column,
+    including those dropped from df
+    """
+    label = template_index.get(key)
+    if label is not None and label in df.index:
+        return (df if full_df is None else full_df).loc[label]
+    return None
 
 
 def filter_dataframe(df, filters):
     """Apply filters to dataframe"""
-    filtered = df.copy()
+    # Combine all filters into one mask so the frame is indexed only once
+    mask = np.ones(len(df), dtype=bool)
 
     for key, value in filters.items():
         if value is None or (isinstance(value, list) and len(value) == 0):
             continue
 
         if isinstance(value, list):
-            if len(value) > 0:
-                filtered = filtered[filtered[key].isin(value)]
+            mask &= category_mask(df[key], value)
         elif isinstance(value, tuple):  # Range filter
-            filtered = filtered[
-                (filtered[key] >= value[0]) & (filtered[key] <= value[1])
-            ]
-        elif isinstance(value, bool):
-            filtered = filtered[filtered[key] == value]
+            mask &= df[key].between(value[0], value[1]).to_numpy()
         else:
-            filtered = filtered[filtered[key] == value]
+            mask &= (df[key] == value).to_numpy()
 
-    return filtered
+    return df[mask]
 
 
 # ============================================================================
-# MAIN APP
+# CHART BUILDERS
 # ============================================================================
+# Builders take small hashable summaries (tuples of (label, count) pairs)
+# rather than dataframes, so a cache lookup costs O(labels) instead of hashing
+# every row, and unchanged charts are not rebuilt on rerun
+
+@st.cache_data(show_spinner=False)
+def pie_chart(counts, **kwargs):
+    """Build a pie chart of (label, count) pairs"""
+    return px.pie(
+        values=[count for _, count in counts],
+        names=[label for label, _ in counts],
+        **kwargs
+    )
+
+
+@st.cache_data(show_spinner=False)
+def count_bar_chart(counts, horizontal=False, layout=None, **kwargs):
+    """Build a bar chart of (label, count) pairs, colored by count"""
+    labels = [label for label, _ in counts]
+    values = [count for _, count in counts]
+
+    if horizontal:
+        fig = px.bar(x=values, y=labels, orientation='h', color=values, **kwargs)
+    else:
+        fig = px.bar(x=labels, y=values, color=values, **kwargs)
 
-def main():
-    # Load data
-    df, data_file = load_data()
-
-    # Header
-    st.markdown('<h1 class="main-header">🤖 Template Harvester Dashboard</h1>', unsafe_allow_html=True)
-    st.markdown(f"<p style='text-align: center; color: gray;'>Analyzing {len(df):,} automation templates from Zapier, Make.com & n8n</p>", unsafe_allow_html=True)
-    st.markdown("---")
+    if layout:
+        fig.update_layout(**layout)
+    return fig
 
-    # Sidebar - Global Filters
-    with st.sidebar:
-        st.header("🔍 Global Filters")
 
-        # Platform filter
-        platforms = st.multiselect(
-            "Platform",
-            options=df['platform'].unique().tolist(),
-            default=df['platform'].unique().tolist()
+@st.cache_data(show_spinner=False)
+def flag_bar_chart(counts, marker_color, **layout):
+    """Build a single-color bar chart of (label, count) pairs"""
+    fig = go.Figure(data=[
+        go.Bar(
+            x=[label for label, _ in counts],
+            y=[count for _, count in counts],
+            marker_color=marker_color
         )
+    ])
+    fig.update_layout(**layout)
+    return fig
 
-        # Automation type filter
-        automation_types = st.multiselect(
-            "Automation Type",
-            options=sorted(df['automation_type'].dropna().unique().tolist()),
-            default=[]
-        )
 
-        # Complexity filter
-        complexity_levels = st.multiselect(
-            "Complexity Level",
-            options=['BEGINNER', 'INTERMEDIATE', 'ADVANCED', 'EXPERT'],
-            default=[]
-        )
+@st.cache_data(show_spinner=False)
+def adoption_chart(percentages):
+    """Build the technology adoption chart from (technology, percentage) pairs"""
+    tech_df = pd.DataFrame(percentages, columns=['Technology', 'Percentage'])
+    return px.bar(
+        tech_df,
+        x='Technology',
+        y='Percentage',
+        title='Technology Feature Adoption Rate',
+        labels={'Percentage': 'Adoption %'},
+        color='Percentage',
+        color_continuous_scale='Teal'
+    )
 
-        # AI-powered filter
-        ai_filter = st.selectbox(
-            "AI-Powered",
-            options=['All', 'Yes', 'No']
-        )
 
-        # Popularity filter
-        popularity_filter = st.multiselect(
-            "Popularity Tier",
-            options=['VIRAL', 'POPULAR', 'MODERATE', 'NICHE', 'UNKNOWN'],
-            default=[]
-        )
+# ============================================================================
+# TAB 1: OVERVIEW
+# ============================================================================
 
-        # App count range
-        st.subheader("App Count")
-        app_count_range = st.slider(
-            "Range",
-            min_value=int(df['app_count'].min()),
-            max_value=int(df['app_count'].max()),
-            value=(int(df['app_count'].min()), int(df['app_count'].max()))
-        )
+@st.fragment
+def render_overview(cube):
+    """Render the Overview tab from the filtered Overview cube"""
+    st.header("📊 Overview & Key Metrics")
 
-        # Apply filters
-        filters = {
-            'platform': platforms if platforms else None,
-            'automation_type': automation_types if automation_types else None,
-            'complexity_level': complexity_levels if complexity_levels else None,
-            'popularity_tier': popularity_filter if popularity_filter else None,
-        }
+    # Compute every aggregate once; the metrics and charts below share them
+    total = cube['templates'].sum()
+    flag_counts = pd.Series({
+        col: cube.loc[cube[col], 'templates'].sum() if col in CUBE_DIMENSIONS else cube[col].sum()
+        for col in TECH_FLAGS if col in cube.columns
+    })
 
-        if ai_filter == 'Yes':
-            filters['is_ai_powered'] = True
-        elif ai_filter == 'No':
-            filters['is_ai_powered'] = False
+    complexity_order = ['BEGINNER', 'INTERMEDIATE', 'ADVANCED', 'EXPERT']
+    complexity_counts = rollup_counts(cube, 'complexity_level')
+    complexity_counts = complexity_counts.reindex(complexity_order, fill_value=0)
 
-        filtered_df = filter_dataframe(df, filters)
+    pop_order = ['VIRAL', 'POPULAR', 'MODERATE', 'NICHE', 'UNKNOWN']
+    pop_counts = rollup_counts(cube, 'popularity_tier')
+    pop_counts = pop_counts.reindex(pop_order, fill_value=0)
 
-        # Apply app count range
-        filtered_df = filtered_df[
-            (filtered_df['app_count'] >= app_count_range[0]) &
-            (filtered_df['app_count'] <= app_count_range[1])
-        ]
+    # Top metrics
+    col1, col2, col3, col4, col5 = st.columns(5)
 
-        st.markdown("---")
-        st.info(f"**{len(filtered_df):,}** templates match filters")
+    with col1:
+        st.metric("Total Templates", f"{total:,}")
 
-        # Export button
-        if st.button("📥 Export Filtered Data"):
-            csv = filtered_df.to_csv(index=False)
-            st.download_button(
-                label="Download CSV",
-                data=csv,
-                file_name="filtered_templates.csv",
-                mime="text/csv"
-            )
+    with col2:
+        ai_count = flag_counts['is_ai_powered']
+        ai_pct = (ai_count / total * 100) if total > 0 else 0
+        st.metric("AI-Powered", f"{ai_count:,}", f"{ai_pct:.1f}%")
 
-    # Main content tabs
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-        "📊 Overview",
-        "🔎 Explorer",
-        "📈 Analytics",
-        "🤖 AI Insights",
-        "🔗 App Analysis",
-        "🆚 Comparison"
-    ])
+    with col3:
+        avg_apps = cube['app_sum'].sum() / total if total > 0 else float('nan')
+        st.metric("Avg Apps", f"{avg_apps:.1f}")
 
-    # ========================================================================
-    # TAB 1: OVERVIEW
-    # ========================================================================
-    with tab1:
-        st.header("📊 Overview & Key Metrics")
+    with col4:
+        beginner_count = complexity_counts['BEGINNER']
+        st.metric("Beginner-Friendly", f"{beginner_count:,}")
 
-        # Top metrics
-        col1, col2, col3, col4, col5 = st.columns(5)
+    with col5:
+        popular_count = pop_counts[['VIRAL', 'POPULAR']].sum()
+        st.metric("Popular Templates", f"{popular_count:,}")
 
-        with col1:
-            st.metric("Total Templates", f"{len(filtered_df):,}")
+    st.markdown("---")
 
-        with col2:
-            ai_count = filtered_df['is_ai_powered'].sum()
-            ai_pct = (ai_count / len(filtered_df) * 100) if len(filtered_df) > 0 else 0
-            st.metric("AI-Powered", f"{ai_count:,}", f"{ai_pct:.1f}%")
+    # Platform distribution
+    col1, col2 = st.columns(2)
 
-        with col3:
-            avg_apps = filtered_df['app_count'].mean()
-            st.metric("Avg Apps", f"{avg_apps:.1f}")
+    with col1:
+        st.subheader("Platform Distribution")
+        platform_counts = rollup_counts(cube, 'platform')
+        fig = pie_chart(
+            tuple(platform_counts.items()),
+            title="Templates by Platform",
+            color_discrete_sequence=px.colors.qualitative.Set3
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
-        with col4:
-            beginner_count = (filtered_df['complexity_level'] == 'BEGINNER').sum()
-            st.metric("Beginner-Friendly", f"{beginner_count:,}")
+    with col2:
+        st.subheader("Automation Types")
+        auto_counts = rollup_counts(cube, 'automation_type').head(10)
+        fig = count_bar_chart(
+            tuple(auto_counts.items()),
+            horizontal=True,
+            layout={'showlegend': False},
+            title="Top 10 Automation Types",
+            labels={'x': 'Count', 'y': 'Type'},
+            color_continuous_scale='Viridis'
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
-        with col5:
-            popular_count = filtered_df['popularity_tier'].isin(['VIRAL', 'POPULAR']).sum()
-            st.metric("Popular Templates", f"{popular_count:,}")
+    # Complexity and Popularity
+    col1, col2 = st.columns(2)
 
-        st.markdown("---")
+    with col1:
+        st.subheader("Complexity Distribution")
+        fig = count_bar_chart(
+            tuple(complexity_counts.items()),
+            title="Templates by Complexity",
+            labels={'x': 'Level', 'y': 'Count'},
+            color_continuous_scale='RdYlGn_r'
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
-        # Platform distribution
-        col1, col2 = st.columns(2)
+    with col2:
+        st.subheader("Popularity Distribution")
+        fig = count_bar_chart(
+            tuple(pop_counts.items()),
+            title="Templates by Popularity",
+            labels={'x': 'Tier', 'y': 'Count'},
+            color_continuous_scale='Blues'
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
-        with col1:
-            st.subheader("Platform Distribution")
-            platform_counts = filtered_df['platform'].value_counts()
-            fig = px.pie(
-                values=platform_counts.values,
-                names=platform_counts.index,
-                title="Templates by Platform",
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            st.plotly_chart(fig, use_container_width=True)
+    # Technology adoption
+    st.subheader("Technology Adoption")
+    col1, col2, col3 = st.columns(3)
 
-        with col2:
-            st.subheader("Automation Types")
-            auto_counts = filtered_df['automation_type'].value_counts().head(10)
-            fig = px.bar(
-                x=auto_counts.values,
-                y=auto_counts.index,
-                orientation='h',
-                title="Top 10 Automation Types",
-                labels={'x': 'Count', 'y': 'Type'},
-                color=auto_counts.values,
-                color_continuous_scale='Viridis'
-            )
-            fig.update_layout(showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
+    tech_data = []
+    for col_name, count in flag_counts.items():
+        pct = (count / total * 100) if total > 0 else 0
+        tech_data.append((TECH_FLAGS[col_name], pct))
 
-        # Complexity and Popularity
-        col1, col2 = st.columns(2)
+    fig = adoption_chart(tuple(tech_data))
+    st.plotly_chart(fig, use_container_width=True)
 
-        with col1:
-            st.subheader("Complexity Distribution")
-            complexity_order = ['BEGINNER', 'INTERMEDIATE', 'ADVANCED', 'EXPERT']
-            complexity_counts = filtered_df['complexity_level'].value_counts()
-            complexity_counts = complexity_counts.reindex(complexity_order, fill_value=0)
-
-            fig = px.bar(
-                x=complexity_counts.index,
-                y=complexity_counts.values,
-                title="Templates by Complexity",
-                labels={'x': 'Level', 'y': 'Count'},
-                color=complexity_counts.values,
-                color_continuous_scale='RdYlGn_r'
-            )
-            st.plotly_chart(fig, use_container_width=True)
 
-        with col2:
-            st.subheader("Popularity Distribution")
-            pop_order = ['VIRAL', 'POPULAR', 'MODERATE', 'NICHE', 'UNKNOWN']
-            pop_counts = filtered_df['popularity_tier'].value_counts()
-            pop_counts = pop_counts.reindex(pop_order, fill_value=0)
-
-            fig = px.bar(
-                x=pop_counts.index,
-                y=pop_counts.values,
-                title="Templates by Popularity",
-                labels={'x': 'Tier', 'y': 'Count'},
-                color=pop_counts.values,
-                color_continuous_scale='Blues'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+# ============================================================================
+# TAB 2: EXPLORER
+# ============================================================================
 
-        # Technology adoption
-        st.subheader("Technology Adoption")
-        col1, col2, col3 = st.columns(3)
-
-        tech_flags = {
-            'is_ai_powered': 'AI-Powered',
-            'is_webhook_based': 'Webhook-Based',
-            'is_scheduled': 'Scheduled',
-            'has_conditional_logic': 'Conditional Logic',
-            'has_loops': 'Has Loops',
-            'uses_llm': 'Uses LLM'
-        }
+@st.fragment
+def render_explorer(filtered_df, df, template_index):
+    """Render the Explorer tab"""
+    st.header("🔎 Template Explorer")
 
-        tech_data = []
-        for col_name, label in tech_flags.items():
-            if col_name in filtered_df.columns:
-                count = filtered_df[col_name].sum()
-                pct = (count / len(filtered_df) * 100) if len(filtered_df) > 0 else 0
-                tech_data.append({'Technology': label, 'Count': count, 'Percentage': pct})
+    # Search
+    search_term = st.text_input("🔍 Search templates", placeholder="Search by name, description, or apps...")
 
-        tech_df = pd.DataFrame(tech_data)
-        fig = px.bar(
-            tech_df,
-            x='Technology',
-            y='Percentage',
-            title='Technology Feature Adoption Rate',
-            labels={'Percentage': 'Adoption %'},
-            color='Percentage',
-            color_continuous_scale='Teal'
+    # Additional filters
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        industry_filter = st.multiselect(
+            "Industry",
+            options=sorted(filtered_df['primary_industry'].dropna().unique().tolist())
         )
-        st.plotly_chart(fig, use_container_width=True)
 
-    # ========================================================================
-    # TAB 2: EXPLORER
-    # ========================================================================
-    with tab2:
-        st.header("🔎 Template Explorer")
+    with col2:
+        setup_time_filter = st.multiselect(
+            "Setup Time",
+            options=['UNDER_5_MIN', '5_15_MIN', '15_30_MIN', '30_MIN_PLUS']
+        )
 
-        # Search
-        search_term = st.text_input("🔍 Search templates", placeholder="Search by name, description, or apps...")
+    with col3:
+        requires_coding_filter = st.selectbox(
+            "Requires Coding",
+            options=['All', 'Yes', 'No']
+        )
 
-        # Additional filters
-        col1, col2, col3 = st.columns(3)
+    # Apply explorer filters as one combined mask
+    mask = np.ones(len(filtered_df), dtype=bool)
 
-        with col1:
-            industry_filter = st.multiselect(
-                "Industry",
-                options=sorted(filtered_df['primary_industry'].dropna().unique().tolist())
-            )
+    if search_term:
+        search_lower = search_term.lower()
+        mask &= filtered_df['_search_blob'].str.contains(search_lower, regex=False, na=False).to_numpy()
 
-        with col2:
-            setup_time_filter = st.multiselect(
-                "Setup Time",
-                options=['UNDER_5_MIN', '5_15_MIN', '15_30_MIN', '30_MIN_PLUS']
-            )
+    if industry_filter:
+        mask &= category_mask(filtered_df['primary_industry'], industry_filter)
 
-        with col3:
-            requires_coding_filter = st.selectbox(
-                "Requires Coding",
-                options=['All', 'Yes', 'No']
-            )
+    if setup_time_filter:
+        mask &= category_mask(filtered_df['estimated_setup_time'], setup_time_filter)
 
-        # Apply explorer filters
-        explorer_df = filtered_df.copy()
+    if requires_coding_filter == 'Yes':
+        mask &= filtered_df['requires_coding'].to_numpy()
+    elif requires_coding_filter == 'No':
+        mask &= ~filtered_df['requires_coding'].to_numpy()
 
-        if search_term:
-            search_lower = search_term.lower()
-            explorer_df = explorer_df[
-                explorer_df['name'].str.lower().str.contains(search_lower, na=False) |
-                explorer_df['description'].str.lower().str.contains(search_lower, na=False) |
-                explorer_df['apps_used'].str.lower().str.contains(search_lower, na=False)
-            ]
+    explorer_df = filtered_df[mask]
 
-        if industry_filter:
-            explorer_df = explorer_df[explorer_df['primary_industry'].isin(industry_filter)]
+    # Sort options
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        sort_by = st.selectbox(
+            "Sort by",
+            options=['name', 'engagement_score', 'app_count', 'complexity_level', 'popularity_tier']
+        )
+    with col2:
+        sort_order = st.radio("Order", options=['Ascending', 'Descending'], horizontal=True)
 
-        if setup_time_filter:
-            explorer_df = explorer_df[explorer_df['estimated_setup_time'].isin(setup_time_filter)]
+    explorer_df = explorer_df.sort_values(
+        by=sort_by,
+        ascending=(sort_order == 'Ascending')
+    )
 
-        if requires_coding_filter == 'Yes':
-            explorer_df = explorer_df[explorer_df['requires_coding'] == True]
-        elif requires_coding_filter == 'No':
-            explorer_df = explorer_df[explorer_df['requires_coding'] == False]
+    st.info(f"Showing **{len(explorer_df):,}** templates")
 
-        # Sort options
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            sort_by = st.selectbox(
-                "Sort by",
-                options=['name', 'engagement_score', 'app_count', 'complexity_level', 'popularity_tier']
-            )
-        with col2:
-            sort_order = st.radio("Order", options=['Ascending', 'Descending'], horizontal=True)
+    # Display templates
+    display_columns = [
+        'name', 'platform', 'automation_type', 'complexity_level',
+        'app_count', 'popularity_tier', 'engagement_score', 'url'
+    ]
 
-        explorer_df = explorer_df.sort_values(
-            by=sort_by,
-            ascending=(sort_order == 'Ascending')
+    # Only one page of rows is sent to the browser on each rerun
+    page_count = max(1, -(-len(explorer_df) // EXPLORER_PAGE_SIZE))
+    page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+    page_start = (page - 1) * EXPLORER_PAGE_SIZE
+    page_df = explorer_df.iloc[page_start:page_start + EXPLORER_PAGE_SIZE]
+    st.caption(f"Page {page} of {page_count}")
+
+    # Prepare display dataframe
+    display_df = page_df[display_columns].copy()
+    display_df = display_df.rename(columns={
+        'name': 'Name',
+        'platform': 'Platform',
+        'automation_type': 'Type',
+        'complexity_level': 'Complexity',
+        'app_count': 'Apps',
+        'popularity_tier': 'Popularity',
+        'engagement_score': 'Score',
+        'url': 'URL'
+    })
+
+    # Data editor for interactivity
+    st.dataframe(
+        display_df,
+        use_container_width=True,
+        hide_index=True,
+        height=600
+    )
+
+    # Template details expander
+    st.subheader("Template Details")
+    if len(explorer_df) > 0:
+        # Keyed by platform id, since several templates can share a name. Built
+        # fresh each run: explorer_df changes with every search and sort choice
+        detail_options = dict(zip(zip(explorer_df['platform'], explorer_df['platform_id']), explorer_df['name']))
+        selected_key = st.selectbox(
+            "Select template to view details",
+            options=list(detail_options),
+            format_func=detail_options.get
         )
 
-        st.info(f"Showing **{len(explorer_df):,}** templates")
+        if selected_key is not None:
+            template = find_template(explorer_df, template_index, selected_key, df)
 
-        # Display templates
-        display_columns = [
-            'name', 'platform', 'automation_type', 'complexity_level',
-            'app_count', 'popularity_tier', 'engagement_score', 'url'
-        ]
+            col1, col2, col3 = st.columns(3)
 
-        # Prepare display dataframe
-        display_df = explorer_df[display_columns].copy()
-        display_df = display_df.rename(columns={
-            'name': 'Name',
-            'platform': 'Platform',
-            'automation_type': 'Type',
-            'complexity_level': 'Complexity',
-            'app_count': 'Apps',
-            'popularity_tier': 'Popularity',
-            'engagement_score': 'Score',
-            'url': 'URL'
-        })
-
-        # Data editor for interactivity
-        st.dataframe(
-            display_df,
-            use_container_width=True,
-            hide_index=True,
-            height=600
-        )
+            with col1:
+                st.markdown("**Basic Info**")
+                st.write(f"**Name:** {template['name']}")
+                st.write(f"**Platform:** {template['platform'].upper()}")
+                st.write(f"**Type:** {template['automation_type']}")
+                st.write(f"**Subtype:** {template.get('automation_subtype', 'N/A')}")
+                st.write(f"**URL:** [{template['url']}]({template['url']})")
 
-        # Template details expander
-        st.subheader("Template Details")
-        if len(explorer_df) > 0:
-            selected_idx = st.selectbox(
-                "Select template to view details",
-                options=range(len(explorer_df)),
-                format_func=lambda x: explorer_df.iloc[x]['name']
-            )
+            with col2:
+                st.markdown("**Technical Details**")
+                st.write(f"**Complexity:** {template['complexity_level']}")
+                st.write(f"**Setup Time:** {template.get('estimated_setup_time', 'N/A')}")
+                st.write(f"**Apps Used:** {template['app_count']}")
+                st.write(f"**Requires Coding:** {'Yes' if template.get('requires_coding') else 'No'}")
+                st.write(f"**Is AI-Powered:** {'Yes' if template.get('is_ai_powered') else 'No'}")
+
+            with col3:
+                st.markdown("**Popularity & Metrics**")
+                st.write(f"**Popularity:** {template.get('popularity_tier', 'UNKNOWN')}")
+                st.write(f"**Engagement Score:** {template.get('engagement_score', 0)}")
+                st.write(f"**Total Views:** {template.get('total_views', 'N/A')}")
+                st.write(f"**Usage Count:** {template.get('usage_count', 'N/A')}")
 
-            if selected_idx is not None:
-                template = explorer_df.iloc[selected_idx]
-
-                col1, col2, col3 = st.columns(3)
-
-                with col1:
-                    st.markdown("**Basic Info**")
-                    st.write(f"**Name:** {template['name']}")
-                    st.write(f"**Platform:** {template['platform'].upper()}")
-                    st.write(f"**Type:** {template['automation_type']}")
-                    st.write(f"**Subtype:** {template.get('automation_subtype', 'N/A')}")
-                    st.write(f"**URL:** [{template['url']}]({template['url']})")
-
-                with col2:
-                    st.markdown("**Technical Details**")
-                    st.write(f"**Complexity:** {template['complexity_level']}")
-                    st.write(f"**Setup Time:** {template.get('estimated_setup_time', 'N/A')}")
-                    st.write(f"**Apps Used:** {template['app_count']}")
-                    st.write(f"**Requires Coding:** {'Yes' if template.get('requires_coding') else 'No'}")
-                    st.write(f"**Is AI-Powered:** {'Yes' if template.get('is_ai_powered') else 'No'}")
-
-                with col3:
-                    st.markdown("**Popularity & Metrics**")
-                    st.write(f"**Popularity:** {template.get('popularity_tier', 'UNKNOWN')}")
-                    st.write(f"**Engagement Score:** {template.get('engagement_score', 0)}")
-                    st.write(f"**Total Views:** {template.get('total_views', 'N/A')}")
-                    st.write(f"**Usage Count:** {template.get('usage_count', 'N/A')}")
-
-                st.markdown("**Description**")
-                st.write(template.get('description', 'No description available')[:500] + "...")
-
-                if template.get('apps_used'):
-                    st.markdown("**Apps/Integrations**")
-                    st.code(template['apps_used'])
-
-    # ========================================================================
-    # TAB 3: ANALYTICS
-    # ========================================================================
-    with tab3:
-        st.header("📈 Advanced Analytics")
-
-        # Correlation analysis
-        st.subheader("App Count vs Complexity")
+            # Missing text is NA, which can't be sliced or tested for truth
+            description = template.get('description')
+            if pd.isna(description):
+                description = 'No description available'
+            st.markdown("**Description**")
+            st.write(description[:500] + "...")
+
+            apps_used = template.get('apps_used')
+            if pd.notna(apps_used) and apps_used:
+                st.markdown("**Apps/Integrations**")
+                st.code(apps_used)
+
+
+# ============================================================================
+# TAB 3: ANALYTICS
+# ============================================================================
+
+@st.fragment
+def render_analytics(filtered_df):
+    """Render the Analytics tab"""
+    st.header("📈 Advanced Analytics")
+
+    # Correlation analysis
+    st.subheader("App Count vs Complexity")
+    scatter_options = dict(
+        x='app_count',
+        y='complexity_level',
+        color='automation_type',
+        title='Complexity vs App Count by Automation Type',
+        category_orders={'complexity_level': ['BEGINNER', 'INTERMEDIATE', 'ADVANCED', 'EXPERT']},
+        render_mode='webgl'
+    )
+    if len(filtered_df) > SCATTER_POINT_LIMIT:
+        # Plot one point per (complexity, app count, type) sized by template count,
+        # instead of one point per template
+        scatter_df = filtered_df.groupby(
+            ['complexity_level', 'app_count', 'automation_type'], observed=True
+        ).agg(
+            templates=('platform_id', 'size'),
+            avg_engagement=('engagement_score', 'mean')
+        ).reset_index()
+        fig = px.scatter(scatter_df, size='templates', hover_data=['avg_engagement'], **scatter_options)
+    else:
         fig = px.scatter(
             filtered_df,
-            x='app_count',
-            y='complexity_level',
-            color='automation_type',
             size='engagement_score',
             hover_data=['name', 'platform'],
-            title='Complexity vs App Count by Automation Type',
-            category_orders={'complexity_level': ['BEGINNER', 'INTERMEDIATE', 'ADVANCED', 'EXPERT']}
+            **scatter_options
+        )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Engagement analysis
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("Engagement by Automation Type")
+        avg_engagement = filtered_df.groupby('automation_type', observed=True)['engagement_score'].mean().sort_values(ascending=False).head(10)
+        fig = px.bar(
+            x=avg_engagement.values,
+            y=avg_engagement.index,
+            orientation='h',
+            title='Average Engagement Score by Type',
+            labels={'x': 'Avg Engagement Score', 'y': 'Automation Type'},
+            color=avg_engagement.values,
+            color_continuous_scale='Purples'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        st.subheader("Engagement by Complexity")
+        engagement_by_complexity = filtered_df.groupby('complexity_level', observed=True)['engagement_score'].mean()
+        engagement_by_complexity = engagement_by_complexity.reindex(['BEGINNER', 'INTERMEDIATE', 'ADVANCED', 'EXPERT'])
+
+        fig = px.line(
+            x=engagement_by_complexity.index,
+            y=engagement_by_complexity.values,
+            title='Average Engagement by Complexity',
+            labels={'x': 'Complexity Level', 'y': 'Avg Engagement Score'},
+            markers=True
         )
         st.plotly_chart(fig, use_container_width=True)
 
-        # Engagement analysis
+    # Platform comparison
+    st.subheader("Platform Comparison")
+
+    # Built-in aggregations run on the categorical codes; a per-group Python
+    # lambda would be called once for every platform/industry
+    platform_stats = filtered_df.assign(
+        is_beginner=category_mask(filtered_df['complexity_level'], ['BEGINNER'])
+    ).groupby('platform', observed=True).agg({
+        'platform_id': 'count',
+        'is_ai_powered': 'sum',
+        'app_count': 'mean',
+        'engagement_score': 'mean',
+        'is_beginner': 'sum'
+    }).round(2)
+
+    platform_stats.columns = ['Total Templates', 'AI-Powered', 'Avg Apps', 'Avg Engagement', 'Beginner Templates']
+
+    st.dataframe(platform_stats, use_container_width=True)
+
+    # Industry analysis
+    st.subheader("Industry Distribution & Engagement")
+    industry_data = filtered_df.groupby('primary_industry', observed=True).agg({
+        'platform_id': 'count',
+        'engagement_score': 'mean',
+        'is_ai_powered': 'sum'
+    }).sort_values('platform_id', ascending=False).head(10)
+
+    industry_data.columns = ['Count', 'Avg Engagement', 'AI-Powered']
+
+    # One long frame drawn as two facets, instead of two traces on subplots
+    industry_long = industry_data.reset_index().melt(
+        id_vars='primary_industry',
+        value_vars=['Count', 'AI-Powered'],
+        var_name='metric'
+    )
+    facet_titles = {'Count': 'Template Count by Industry', 'AI-Powered': 'AI Adoption by Industry'}
+    fig = px.bar(
+        industry_long,
+        x='primary_industry',
+        y='value',
+        color='metric',
+        facet_col='metric',
+        category_orders={'primary_industry': industry_data.index.tolist()},
+        color_discrete_map={'Count': px.colors.qualitative.Plotly[0], 'AI-Powered': 'lightblue'}
+    )
+    fig.for_each_annotation(lambda a: a.update(text=facet_titles[a.text.split('=')[-1]]))
+    fig.update_xaxes(title=None)
+    fig.update_yaxes(matches=None, showticklabels=True, title=None)
+    fig.update_xaxes(tickangle=45)
+    fig.update_layout(height=500, showlegend=False)
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Time-saving analysis
+    st.subheader("Estimated Time Savings Distribution")
+    time_saved_order = ['UNDER_1HR_WEEK', '1_5HR_WEEK', '5_20HR_WEEK', '20HR_PLUS_WEEK']
+    time_saved_counts = count_in_order(filtered_df['estimated_time_saved'], time_saved_order)
+
+    fig = px.funnel(
+        y=time_saved_counts.index,
+        x=time_saved_counts.values,
+        title='Templates by Time Savings Potential'
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+# ============================================================================
+# TAB 4: AI INSIGHTS
+# ============================================================================
+
+@st.fragment
+def render_ai_insights(filtered_df, ai_filter):
+    """Render the AI Insights tab"""
+    st.header("🤖 AI-Powered Template Insights")
+
+    # The sidebar AI filter already decides whether any AI rows are left
+    if ai_filter == 'No':
+        st.info('The AI-Powered filter is set to "No", so there are no AI templates to show.')
+        return
+
+    ai_df = filtered_df if ai_filter == 'Yes' else filtered_df[filtered_df['is_ai_powered'].to_numpy()]
+
+    if len(ai_df) == 0:
+        st.warning("No AI-powered templates in current filters")
+    else:
+        ai_features = count_flags(ai_df, AI_FEATURES)
+
+        # AI metrics
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric("AI Templates", f"{len(ai_df):,}")
+
+        with col2:
+            ai_pct = (len(ai_df) / len(filtered_df) * 100) if len(filtered_df) > 0 else 0
+            st.metric("% of Total", f"{ai_pct:.1f}%")
+
+        with col3:
+            llm_count = ai_features['Uses LLM']
+            st.metric("Uses LLM", f"{llm_count:,}")
+
+        with col4:
+            rag_count = ai_features['Has RAG']
+            st.metric("Uses RAG", f"{rag_count:,}")
+
+        # AI use cases
         col1, col2 = st.columns(2)
 
         with col1:
-            st.subheader("Engagement by Automation Type")
-            avg_engagement = filtered_df.groupby('automation_type')['engagement_score'].mean().sort_values(ascending=False).head(10)
-            fig = px.bar(
-                x=avg_engagement.values,
-                y=avg_engagement.index,
-                orientation='h',
-                title='Average Engagement Score by Type',
-                labels={'x': 'Avg Engagement Score', 'y': 'Automation Type'},
-                color=avg_engagement.values,
-                color_continuous_scale='Purples'
-            )
+            st.subheader("AI Use Cases")
+            ai_use_cases = count_values(ai_df['ai_use_case']).head(10)
+            fig = pie_chart(tuple(ai_use_cases.items()), title="Distribution of AI Use Cases")
             st.plotly_chart(fig, use_container_width=True)
 
         with col2:
-            st.subheader("Engagement by Complexity")
-            engagement_by_complexity = filtered_df.groupby('complexity_level')['engagement_score'].mean()
-            engagement_by_complexity = engagement_by_complexity.reindex(['BEGINNER', 'INTERMEDIATE', 'ADVANCED', 'EXPERT'])
-
-            fig = px.line(
-                x=engagement_by_complexity.index,
-                y=engagement_by_complexity.values,
-                title='Average Engagement by Complexity',
-                labels={'x': 'Complexity Level', 'y': 'Avg Engagement Score'},
-                markers=True
+            st.subheader("AI Providers")
+            ai_providers = count_values(ai_df['ai_provider'])
+            fig = count_bar_chart(
+                tuple(ai_providers.items()),
+                title="AI Provider Distribution",
+                labels={'x': 'Provider', 'y': 'Count'},
+                color_continuous_scale='Viridis'
             )
             st.plotly_chart(fig, use_container_width=True)
 
-        # Platform comparison
-        st.subheader("Platform Comparison")
+        # AI complexity
+        st.subheader("AI Template Complexity")
+        complexity_order = ['BEGINNER', 'INTERMEDIATE', 'ADVANCED', 'EXPERT']
+        ai_complexity = count_in_order(ai_df['complexity_level'], complexity_order)
 
-        platform_stats = filtered_df.groupby('platform').agg({
-            'platform_id': 'count',
-            'is_ai_powered': 'sum',
-            'app_count': 'mean',
-            'engagement_score': 'mean',
-            'complexity_level': lambda x: (x == 'BEGINNER').sum()
-        }).round(2)
+        fig = count_bar_chart(
+            tuple(ai_complexity.items()),
+            title='AI Templates by Complexity',
+            labels={'x': 'Complexity', 'y': 'Count'},
+            color_continuous_scale='RdYlGn_r'
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
-        platform_stats.columns = ['Total Templates', 'AI-Powered', 'Avg Apps', 'Avg Engagement', 'Beginner Templates']
+        # AI features matrix
+        st.subheader("AI Feature Adoption")
 
-        st.dataframe(platform_stats, use_container_width=True)
+        fig = flag_bar_chart(
+            tuple(ai_features.items()),
+            'lightseagreen',
+            title='AI Feature Adoption Count',
+            xaxis_title='Feature',
+            yaxis_title='Number of Templates'
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
-        # Industry analysis
-        st.subheader("Industry Distribution & Engagement")
-        industry_data = filtered_df.groupby('primary_industry').agg({
-            'platform_id': 'count',
-            'engagement_score': 'mean',
-            'is_ai_powered': lambda x: (x == True).sum()
-        }).sort_values('platform_id', ascending=False).head(10)
+        # Top AI templates
+        st.subheader("Top 10 Most Popular AI Templates")
+        top_ai = ai_df.nlargest(10, 'engagement_score')[['name', 'ai_use_case', 'ai_provider', 'engagement_score', 'popularity_tier']]
+        st.dataframe(top_ai, use_container_width=True, hide_index=True)
 
-        industry_data.columns = ['Count', 'Avg Engagement', 'AI-Powered']
 
-        fig = make_subplots(
-            rows=1, cols=2,
-            subplot_titles=('Template Count by Industry', 'AI Adoption by Industry'),
-            specs=[[{'type': 'bar'}, {'type': 'bar'}]]
-        )
+# ============================================================================
+# TAB 5: APP ANALYSIS
+# ============================================================================
 
-        fig.add_trace(
-            go.Bar(x=industry_data.index, y=industry_data['Count'], name='Count'),
-            row=1, col=1
-        )
+@st.fragment
+def render_app_analysis(filtered_df):
+    """Render the App Analysis tab"""
+    st.header("🔗 App & Integration Analysis")
 
-        fig.add_trace(
-            go.Bar(x=industry_data.index, y=industry_data['AI-Powered'], name='AI-Powered', marker_color='lightblue'),
-            row=1, col=2
-        )
+    # App category adoption
+    st.subheader("App Category Adoption")
 
-        fig.update_xaxes(tickangle=45)
-        fig.update_layout(height=500, showlegend=False)
+    app_categories = count_flags(filtered_df, APP_CATEGORIES)
 
-        st.plotly_chart(fig, use_container_width=True)
+    fig = flag_bar_chart(
+        tuple(app_categories.items()),
+        'indianred',
+        title='App Category Usage',
+        xaxis_title='Category',
+        yaxis_title='Number of Templates',
+        xaxis_tickangle=45
+    )
+    st.plotly_chart(fig, use_container_width=True)
 
-        # Time-saving analysis
-        st.subheader("Estimated Time Savings Distribution")
-        time_saved_counts = filtered_df['estimated_time_saved'].value_counts()
-        time_saved_order = ['UNDER_1HR_WEEK', '1_5HR_WEEK', '5_20HR_WEEK', '20HR_PLUS_WEEK']
-        time_saved_counts = time_saved_counts.reindex(time_saved_order, fill_value=0)
+    # Most used apps
+    st.subheader("Most Frequently Used Apps")
 
-        fig = px.funnel(
-            y=time_saved_counts.index,
-            x=time_saved_counts.values,
-            title='Templates by Time Savings Potential'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+    top_apps = count_top_apps(filtered_df['apps_used'], 30)
 
-    # ========================================================================
-    # TAB 4: AI INSIGHTS
-    # ========================================================================
-    with tab4:
-        st.header("🤖 AI-Powered Template Insights")
+    fig = count_bar_chart(
+        tuple(top_apps.items()),
+        horizontal=True,
+        layout={'height': 800},
+        title='Top 30 Most Used Apps',
+        labels={'x': 'Number of Templates', 'y': 'App/Integration'},
+        color_continuous_scale='Viridis'
+    )
+    st.plotly_chart(fig, use_container_width=True)
 
-        ai_df = filtered_df[filtered_df['is_ai_powered'] == True]
+    # App count distribution
+    st.subheader("App Count Distribution")
 
-        if len(ai_df) == 0:
-            st.warning("No AI-powered templates in current filters")
-        else:
-            # AI metrics
-            col1, col2, col3, col4 = st.columns(4)
+    app_count_dist = filtered_df['app_count'].value_counts().sort_index()
 
-            with col1:
-                st.metric("AI Templates", f"{len(ai_df):,}")
+    fig = px.histogram(
+        filtered_df,
+        x='app_count',
+        nbins=20,
+        title='Distribution of App Count per Template',
+        labels={'app_count': 'Number of Apps', 'count': 'Number of Templates'},
+        color_discrete_sequence=['steelblue']
+    )
+    st.plotly_chart(fig, use_container_width=True)
 
-            with col2:
-                ai_pct = (len(ai_df) / len(filtered_df) * 100) if len(filtered_df) > 0 else 0
-                st.metric("% of Total", f"{ai_pct:.1f}%")
+    # Integration patterns
+    st.subheader("Integration Patterns")
+    pattern_counts = count_values(filtered_df['integration_pattern'])
 
-            with col3:
-                llm_count = ai_df['uses_llm'].sum() if 'uses_llm' in ai_df.columns else 0
-                st.metric("Uses LLM", f"{llm_count:,}")
+    fig = pie_chart(tuple(pattern_counts.items()), title="Distribution of Integration Patterns")
+    st.plotly_chart(fig, use_container_width=True)
 
-            with col4:
-                rag_count = ai_df['has_rag'].sum() if 'has_rag' in ai_df.columns else 0
-                st.metric("Uses RAG", f"{rag_count:,}")
 
-            # AI use cases
-            col1, col2 = st.columns(2)
+# ============================================================================
+# TAB 6: COMPARISON
+# ============================================================================
 
-            with col1:
-                st.subheader("AI Use Cases")
-                ai_use_cases = ai_df['ai_use_case'].value_counts().head(10)
-                fig = px.pie(
-                    values=ai_use_cases.values,
-                    names=ai_use_cases.index,
-                    title="Distribution of AI Use Cases"
-                )
-                st.plotly_chart(fig, use_container_width=True)
+@st.fragment
+def render_comparison(filtered_df, df, template_index):
+    """Render the Comparison tab"""
+    st.header("🆚 Template Comparison Tool")
 
-            with col2:
-                st.subheader("AI Providers")
-                ai_providers = ai_df['ai_provider'].value_counts()
-                fig = px.bar(
-                    x=ai_providers.index,
-                    y=ai_providers.values,
-                    title="AI Provider Distribution",
-                    labels={'x': 'Provider', 'y': 'Count'},
-                    color=ai_providers.values,
-                    color_continuous_scale='Viridis'
-                )
-                st.plotly_chart(fig, use_container_width=True)
-
-            # AI complexity
-            st.subheader("AI Template Complexity")
-            ai_complexity = ai_df['complexity_level'].value_counts()
-            complexity_order = ['BEGINNER', 'INTERMEDIATE', 'ADVANCED', 'EXPERT']
-            ai_complexity = ai_complexity.reindex(complexity_order, fill_value=0)
-
-            fig = px.bar(
-                x=ai_complexity.index,
-                y=ai_complexity.values,
-                title='AI Templates by Complexity',
-                labels={'x': 'Complexity', 'y': 'Count'},
-                color=ai_complexity.values,
-                color_continuous_scale='RdYlGn_r'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+    st.write("Select templates to compare side-by-side")
 
-            # AI features matrix
-            st.subheader("AI Feature Adoption")
-            ai_features = {
-                'Uses LLM': ai_df['uses_llm'].sum() if 'uses_llm' in ai_df.columns else 0,
-                'Uses Embeddings': ai_df['uses_embeddings'].sum() if 'uses_embeddings' in ai_df.columns else 0,
-                'Uses Vision': ai_df['uses_vision'].sum() if 'uses_vision' in ai_df.columns else 0,
-                'Uses Voice': ai_df['uses_voice'].sum() if 'uses_voice' in ai_df.columns else 0,
-                'Has Memory': ai_df['has_memory'].sum() if 'has_memory' in ai_df.columns else 0,
-                'Has RAG': ai_df['has_rag'].sum() if 'has_rag' in ai_df.columns else 0
-            }
-
-            fig = go.Figure(data=[
-                go.Bar(
-                    x=list(ai_features.keys()),
-                    y=list(ai_features.values()),
-                    marker_color='lightseagreen'
-                )
-            ])
-            fig.update_layout(
-                title='AI Feature Adoption Count',
-                xaxis_title='Feature',
-                yaxis_title='Number of Templates'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+    # Template selection
+    col1, col2 = st.columns(2)
 
-            # Top AI templates
-            st.subheader("Top 10 Most Popular AI Templates")
-            top_ai = ai_df.nlargest(10, 'engagement_score')[['name', 'ai_use_case', 'ai_provider', 'engagement_score', 'popularity_tier']]
-            st.dataframe(top_ai, use_container_width=True, hide_index=True)
-
-    # ========================================================================
-    # TAB 5: APP ANALYSIS
-    # ========================================================================
-    with tab5:
-        st.header("🔗 App & Integration Analysis")
-
-        # App category adoption
-        st.subheader("App Category Adoption")
-
-        app_categories = {
-            'Spreadsheet': filtered_df['uses_spreadsheet'].sum() if 'uses_spreadsheet' in filtered_df.columns else 0,
-            'Email': filtered_df['uses_email'].sum() if 'uses_email' in filtered_df.columns else 0,
-            'Storage': filtered_df['uses_storage'].sum() if 'uses_storage' in filtered_df.columns else 0,
-            'Communication': filtered_df['uses_communication'].sum() if 'uses_communication' in filtered_df.columns else 0,
-            'CRM': filtered_df['uses_crm'].sum() if 'uses_crm' in filtered_df.columns else 0,
-            'Social Media': filtered_df['uses_social_media'].sum() if 'uses_social_media' in filtered_df.columns else 0,
-            'E-commerce': filtered_df['uses_ecommerce'].sum() if 'uses_ecommerce' in filtered_df.columns else 0,
-            'Project Mgmt': filtered_df['uses_project_mgmt'].sum() if 'uses_project_mgmt' in filtered_df.columns else 0,
-            'Forms': filtered_df['uses_forms'].sum() if 'uses_forms' in filtered_df.columns else 0
-        }
+    # Keyed by platform id, since several templates can share a name
+    comparison_options = template_options(filtered_df, COMPARISON_NAME_LIMIT)
+    if len(filtered_df) > COMPARISON_NAME_LIMIT:
+        st.caption(
+            f"Listing the {COMPARISON_NAME_LIMIT:,} most engaging of {len(filtered_df):,} templates; "
+            "use the Explorer to find the rest"
+        )
+
+    with col1:
+        template1_key = st.selectbox("Template 1", options=list(comparison_options),
+                                     format_func=comparison_options.get, key='t1')
+
+    with col2:
+        template2_key = st.selectbox("Template 2", options=list(comparison_options),
+                                     format_func=comparison_options.get, key='t2')
+
+    if template1_key and template2_key:
+        template1 = find_template(filtered_df, template_index, template1_key, df)
+        template2 = find_template(filtered_df, template_index, template2_key, df)
+        template1_name = comparison_options[template1_key]
+        template2_name = comparison_options[template2_key]
+
+        # Comparison table
+        comparison_fields = [
+            ('Platform', 'platform'),
+            ('Automation Type', 'automation_type'),
+            ('Subtype', 'automation_subtype'),
+            ('Industry', 'primary_industry'),
+            ('Complexity', 'complexity_level'),
+            ('Setup Time', 'estimated_setup_time'),
+            ('App Count', 'app_count'),
+            ('AI-Powered', 'is_ai_powered'),
+            ('Requires Coding', 'requires_coding'),
+            ('Popularity Tier', 'popularity_tier'),
+            ('Engagement Score', 'engagement_score'),
+            ('Trigger Type', 'primary_trigger_type'),
+            ('Action Type', 'primary_action_type'),
+            ('Estimated Time Saved', 'estimated_time_saved')
+        ]
+
+        comparison_data = []
+        for label, field in comparison_fields:
+            val1 = template1.get(field, 'N/A')
+            val2 = template2.get(field, 'N/A')
+
+            # Format booleans
+            if isinstance(val1, bool):
+                val1 = 'Yes' if val1 else 'No'
+            if isinstance(val2, bool):
+                val2 = 'Yes' if val2 else 'No'
+
+            comparison_data.append({
+                'Attribute': label,
+                template1_name: val1,
+                template2_name: val2
+            })
+
+        comparison_df = pd.DataFrame(comparison_data)
+        st.dataframe(comparison_df, use_container_width=True, hide_index=True)
+
+        # Visual comparison
+        st.subheader("Visual Comparison")
+
+        # Radar chart for numeric metrics
+        categories = ['App Count', 'Engagement Score', 'Node Count']
+
+        fig = go.Figure()
+
+        fig.add_trace(go.Scatterpolar(
+            r=[
+                template1.get('app_count', 0),
+                template1.get('engagement_score', 0),
+                template1.get('node_count', 0)
+            ],
+            theta=categories,
+            fill='toself',
+            name=template1_name
+        ))
+
+        fig.add_trace(go.Scatterpolar(
+            r=[
+                template2.get('app_count', 0),
+                template2.get('engagement_score', 0),
+                template2.get('node_count', 0)
+            ],
+            theta=categories,
+            fill='toself',
+            name=template2_name
+        ))
 
-        fig = go.Figure(data=[
-            go.Bar(
-                x=list(app_categories.keys()),
-                y=list(app_categories.values()),
-                marker_color='indianred'
-            )
-        ])
         fig.update_layout(
-            title='App Category Usage',
-            xaxis_title='Category',
-            yaxis_title='Number of Templates',
+            polar=dict(radialaxis=dict(visible=True)),
+            showlegend=True,
+            title="Numeric Metrics Comparison"
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+
+        # Feature comparison
+        st.subheader("Feature Comparison")
+
+        features = [
+            ('AI-Powered', 'is_ai_powered'),
+            ('Webhook-Based', 'is_webhook_based'),
+            ('Scheduled', 'is_scheduled'),
+            ('Real-time', 'is_realtime'),
+            ('Conditional Logic', 'has_conditional_logic'),
+            ('Has Loops', 'has_loops'),
+            ('Uses LLM', 'uses_llm'),
+            ('Uses Spreadsheet', 'uses_spreadsheet'),
+            ('Uses Email', 'uses_email'),
+            ('Uses Communication', 'uses_communication')
+        ]
+
+        feature_data = []
+        for label, field in features:
+            t1_val = 1 if template1.get(field) == True else 0
+            t2_val = 1 if template2.get(field) == True else 0
+            feature_data.append({
+                'Feature': label,
+                template1_name: t1_val,
+                template2_name: t2_val
+            })
+
+        feature_df = pd.DataFrame(feature_data)
+
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            x=feature_df['Feature'],
+            y=feature_df[template1_name],
+            name=template1_name
+        ))
+        fig.add_trace(go.Bar(
+            x=feature_df['Feature'],
+            y=feature_df[template2_name],
+            name=template2_name
+        ))
+
+        fig.update_layout(
+            barmode='group',
+            title='Feature Availability (1=Yes, 0=No)',
             xaxis_tickangle=45
         )
         st.plotly_chart(fig, use_container_width=True)
 
-        # Most used apps
-        st.subheader("Most Frequently Used Apps")
 
-        # Extract all apps
-        all_apps = []
-        for apps_str in filtered_df['apps_used'].dropna():
-            if apps_str:
-                apps = [a.strip() for a in str(apps_str).replace(';', ',').split(',') if a.strip()]
-                all_apps.extend(apps[:10])  # Limit to first 10 apps per template
+# ============================================================================
+# MAIN APP
+# ============================================================================
 
-        app_counts = Counter(all_apps)
-        top_apps = dict(app_counts.most_common(30))
+def main():
+    # Load data
+    df, data_file = load_data()
+    filter_options = get_filter_options(df, data_file)
+    template_index = get_template_index(df, data_file)
+    overview_cube = get_overview_cube(df, data_file)
 
-        fig = px.bar(
-            x=list(top_apps.values()),
-            y=list(top_apps.keys()),
-            orientation='h',
-            title='Top 30 Most Used Apps',
-            labels={'x': 'Number of Templates', 'y': 'App/Integration'},
-            color=list(top_apps.values()),
-            color_continuous_scale='Viridis'
+    # Header
+    st.markdown('<h1 class="main-header">🤖 Template Harvester Dashboard</h1>', unsafe_allow_html=True)
+    st.markdown(f"<p style='text-align: center; color: gray;'>Analyzing {len(df):,} automation templates from Zapier, Make.com & n8n</p>", unsafe_allow_html=True)
+    st.markdown("---")
+
+    # Sidebar - Global Filters
+    with st.sidebar:
+        st.header("🔍 Global Filters")
+
+        # Platform filter
+        platforms = st.multiselect(
+            "Platform",
+            options=filter_options['platforms'],
+            default=filter_options['platforms']
         )
-        fig.update_layout(height=800)
-        st.plotly_chart(fig, use_container_width=True)
 
-        # App count distribution
-        st.subheader("App Count Distribution")
+        # Automation type filter
+        automation_types = st.multiselect(
+            "Automation Type",
+            options=filter_options['automation_types'],
+            default=[]
+        )
 
-        app_count_dist = filtered_df['app_count'].value_counts().sort_index()
+        # Complexity filter
+        complexity_levels = st.multiselect(
+            "Complexity Level",
+            options=['BEGINNER', 'INTERMEDIATE', 'ADVANCED', 'EXPERT'],
+            default=[]
+        )
 
-        fig = px.histogram(
-            filtered_df,
-            x='app_count',
-            nbins=20,
-            title='Distribution of App Count per Template',
-            labels={'app_count': 'Number of Apps', 'count': 'Number of Templates'},
-            color_discrete_sequence=['steelblue']
+        # AI-powered filter
+        ai_filter = st.selectbox(
+            "AI-Powered",
+            options=['All', 'Yes', 'No']
         )
-        st.plotly_chart(fig, use_container_width=True)
 
-        # Integration patterns
-        st.subheader("Integration Patterns")
-        pattern_counts = filtered_df['integration_pattern'].value_counts()
+        # Popularity filter
+        popularity_filter = st.multiselect(
+            "Popularity Tier",
+            options=['VIRAL', 'POPULAR', 'MODERATE', 'NICHE', 'UNKNOWN'],
+            default=[]
+        )
 
-        fig = px.pie(
-            values=pattern_counts.values,
-            names=pattern_counts.index,
-            title="Distribution of Integration Patterns"
+        # App count range
+        st.subheader("App Count")
+        app_count_range = st.slider(
+            "Range",
+            min_value=filter_options['app_min'],
+            max_value=filter_options['app_max'],
+            value=(filter_options['app_min'], filter_options['app_max'])
         )
-        st.plotly_chart(fig, use_container_width=True)
 
-    # ========================================================================
-    # TAB 6: COMPARISON
-    # ========================================================================
-    with tab6:
-        st.header("🆚 Template Comparison Tool")
+        # Apply filters
+        filters = {
+            'platform': platforms if platforms else None,
+            'automation_type': automation_types if automation_types else None,
+            'complexity_level': complexity_levels if complexity_levels else None,
+            'popularity_tier': popularity_filter if popularity_filter else None,
+        }
+
+        if ai_filter == 'Yes':
+            filters['is_ai_powered'] = True
+        elif ai_filter == 'No':
+            filters['is_ai_powered'] = False
+
+        # App count range, applied in the same mask as the other filters
+        filters['app_count'] = tuple(app_count_range)
 
-        st.write("Select templates to compare side-by-side")
+        filtered_df = filter_dataframe(df, filters)
 
-        # Template selection
-        col1, col2 = st.columns(2)
+        # The Overview reads the same filters from the pre-aggregated cube
+        filtered_cube = filter_dataframe(overview_cube, filters)
 
-        template_options = filtered_df['name'].tolist()
+        st.markdown("---")
+        st.info(f"**{len(filtered_df):,}** templates match filters")
 
-        with col1:
-            template1_name = st.selectbox("Template 1", options=template_options, key='t1')
+        # Export button
+        if st.button("📥 Export Filtered Data"):
+            export_table = pa.Table.from_pandas(filtered_df.drop(columns='_search_blob'), preserve_index=False)
 
-        with col2:
-            template2_name = st.selectbox("Template 2", options=template_options, key='t2')
-
-        if template1_name and template2_name:
-            template1 = filtered_df[filtered_df['name'] == template1_name].iloc[0]
-            template2 = filtered_df[filtered_df['name'] == template2_name].iloc[0]
-
-            # Comparison table
-            comparison_fields = [
-                ('Platform', 'platform'),
-                ('Automation Type', 'automation_type'),
-                ('Subtype', 'automation_subtype'),
-                ('Industry', 'primary_industry'),
-                ('Complexity', 'complexity_level'),
-                ('Setup Time', 'estimated_setup_time'),
-                ('App Count', 'app_count'),
-                ('AI-Powered', 'is_ai_powered'),
-                ('Requires Coding', 'requires_coding'),
-                ('Popularity Tier', 'popularity_tier'),
-                ('Engagement Score', 'engagement_score'),
-                ('Trigger Type', 'primary_trigger_type'),
-                ('Action Type', 'primary_action_type'),
-                ('Estimated Time Saved', 'estimated_time_saved')
-            ]
-
-            comparison_data = []
-            for label, field in comparison_fields:
-                val1 = template1.get(field, 'N/A')
-                val2 = template2.get(field, 'N/A')
-
-                # Format booleans
-                if isinstance(val1, bool):
-                    val1 = 'Yes' if val1 else 'No'
-                if isinstance(val2, bool):
-                    val2 = 'Yes' if val2 else 'No'
-
-                comparison_data.append({
-                    'Attribute': label,
-                    template1_name: val1,
-                    template2_name: val2
-                })
-
-            comparison_df = pd.DataFrame(comparison_data)
-            st.dataframe(comparison_df, use_container_width=True, hide_index=True)
-
-            # Visual comparison
-            st.subheader("Visual Comparison")
-
-            # Radar chart for numeric metrics
-            categories = ['App Count', 'Engagement Score', 'Node Count']
-
-            fig = go.Figure()
-
-            fig.add_trace(go.Scatterpolar(
-                r=[
-                    template1.get('app_count', 0),
-                    template1.get('engagement_score', 0),
-                    template1.get('node_count', 0)
-                ],
-                theta=categories,
-                fill='toself',
-                name=template1_name
-            ))
-
-            fig.add_trace(go.Scatterpolar(
-                r=[
-                    template2.get('app_count', 0),
-                    template2.get('engagement_score', 0),
-                    template2.get('node_count', 0)
-                ],
-                theta=categories,
-                fill='toself',
-                name=template2_name
-            ))
-
-            fig.update_layout(
-                polar=dict(radialaxis=dict(visible=True)),
-                showlegend=True,
-                title="Numeric Metrics Comparison"
+            # Arrow's CSV writer fills one buffer instead of building a Python string
+            csv_buffer = io.BytesIO()
+            pacsv.write_csv(encode_tag_columns(export_table), csv_buffer)
+            st.download_button(
+                label="Download CSV",
+                data=csv_buffer.getvalue(),
+                file_name="filtered_templates.csv",
+                mime="text/csv"
             )
 
-            st.plotly_chart(fig, use_container_width=True)
-
-            # Feature comparison
-            st.subheader("Feature Comparison")
-
-            features = [
-                ('AI-Powered', 'is_ai_powered'),
-                ('Webhook-Based', 'is_webhook_based'),
-                ('Scheduled', 'is_scheduled'),
-                ('Real-time', 'is_realtime'),
-                ('Conditional Logic', 'has_conditional_logic'),
-                ('Has Loops', 'has_loops'),
-                ('Uses LLM', 'uses_llm'),
-                ('Uses Spreadsheet', 'uses_spreadsheet'),
-                ('Uses Email', 'uses_email'),
-                ('Uses Communication', 'uses_communication')
-            ]
-
-            feature_data = []
-            for label, field in features:
-                t1_val = 1 if template1.get(field) == True else 0
-                t2_val = 1 if template2.get(field) == True else 0
-                feature_data.append({
-                    'Feature': label,
-                    template1_name: t1_val,
-                    template2_name: t2_val
-                })
-
-            feature_df = pd.DataFrame(feature_data)
-
-            fig = go.Figure()
-            fig.add_trace(go.Bar(
-                x=feature_df['Feature'],
-                y=feature_df[template1_name],
-                name=template1_name
-            ))
-            fig.add_trace(go.Bar(
-                x=feature_df['Feature'],
-                y=feature_df[template2_name],
-                name=template2_name
-            ))
-
-            fig.update_layout(
-                barmode='group',
-                title='Feature Availability (1=Yes, 0=No)',
-                xaxis_tickangle=45
+            parquet_buffer = io.BytesIO()
+            pq.write_table(export_table, parquet_buffer, compression='zstd')
+            st.download_button(
+                label="Download Parquet",
+                data=parquet_buffer.getvalue(),
+                file_name="filtered_templates.parquet",
+                mime="application/vnd.apache.parquet"
             )
-            st.plotly_chart(fig, use_container_width=True)
+
+    # The export above keeps every column; the tabs only need USED_COLUMNS
+    filtered_df = filtered_df[[col for col in filtered_df.columns if col in USED_COLUMNS]]
+
+    # Main content sections. Only the selected section is rendered, so a rerun
+    # builds the figures of one tab instead of all six.
+    sections = {
+        "📊 Overview": lambda: render_overview(filtered_cube),
+        "🔎 Explorer": lambda: render_explorer(filtered_df, df, template_index),
+        "📈 Analytics": lambda: render_analytics(filtered_df),
+        "🤖 AI Insights": lambda: render_ai_insights(filtered_df, ai_filter),
+        "🔗 App Analysis": lambda: render_app_analysis(filtered_df),
+        "🆚 Comparison": lambda: render_comparison(filtered_df, df, template_index),
+    }
+    st.session_state.setdefault('active_tab', next(iter(sections)))
+    active_tab = st.radio(
+        "Dashboard section",
+        list(sections),
+        key='active_tab',
+        horizontal=True,
+        label_visibility="collapsed"
+    )
+
+    # Each section is a fragment, so its own widgets rerun only that section
+    sections[active_tab]()
 
     # Footer
     st.markdown("---")
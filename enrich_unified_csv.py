@@ -4,13 +4,30 @@ Enrich unified CSV with categorization and filtering columns
 - Adds 40+ new columns for advanced filtering and analysis
 - Categorizes templates by type, industry, complexity, and features
 - Calculates popularity metrics and business value indicators
+
+Columns that are a plain function of other output columns are not written;
+readers derive them (the dashboard loader does):
+- requires_api_keys: app_count > 0 (most integrations need API keys)
+- popularity: the larger of total_views and usage_count, missing as 0
 """
+import argparse
 import csv
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 import json
 import re
 from datetime import datetime
-from collections import Counter
 import logging
+import os
+import sys
+from functools import lru_cache
+from itertools import compress
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 # Setup logging
 logging.basicConfig(
@@ -51,398 +68,106 @@ PROJECT_MGMT_APPS = ['trello', 'asana', 'jira', 'notion', 'clickup', 'monday', '
 
 FORMS_APPS = ['typeform', 'google forms', 'forms', 'jotform', 'survey']
 
+WEBHOOK_KEYWORDS = ['webhook', 'gateway']
 
-# ============================================================================
-# HELPER FUNCTIONS
-# ============================================================================
+SCHEDULE_KEYWORDS = ['schedule', 'daily', 'weekly', 'cron', 'recurring']
 
-def contains_any(text, keywords):
-    """Check if text contains any of the keywords (case-insensitive)"""
-    if not text:
-        return False
-    text_lower = text.lower()
-    return any(keyword.lower() in text_lower for keyword in keywords)
+REALTIME_KEYWORDS = ['real-time', 'instant', 'immediately', 'watch']
 
+CONDITIONAL_KEYWORDS = ['if', 'conditional', 'filter', 'branch', 'router']
 
-def count_apps(apps_used_str):
-    """Count number of apps from apps_used string"""
-    if not apps_used_str:
-        return 0
-    # Split by comma or semicolon
-    apps = [a.strip() for a in apps_used_str.replace(';', ',').split(',') if a.strip()]
-    return len(apps)
+LOOP_KEYWORDS = ['loop', 'iterate', 'repeat', 'for each']
 
+LLM_KEYWORDS = ['llm', 'language model', 'chat model', 'completion']
 
-def calculate_percentile(values, target_value):
-    """Calculate percentile of target value in list of values"""
-    if not values or target_value is None:
-        return None
-    values_sorted = sorted([v for v in values if v is not None])
-    if not values_sorted:
-        return None
-    try:
-        target = float(target_value)
-        smaller_count = sum(1 for v in values_sorted if float(v) <= target)
-        return (smaller_count / len(values_sorted)) * 100
-    except:
-        return None
+EMBEDDING_KEYWORDS = ['embedding', 'vector', 'pinecone', 'qdrant', 'weaviate']
 
+VISION_KEYWORDS = ['image generation', 'dall-e', 'vision', 'image analysis', 'stable diffusion']
 
-# ============================================================================
-# CATEGORIZATION FUNCTIONS
-# ============================================================================
+VOICE_KEYWORDS = ['whisper', 'voice', 'audio', 'transcribe', 'speech', 'eleven']
 
-def determine_automation_type(row):
-    """Determine primary automation type"""
-    apps = row.get('apps_used', '').lower()
-    desc = row.get('description', '').lower()
-    name = row.get('name', '').lower()
-    combined = f"{apps} {desc} {name}"
-
-    # Check for AI
-    if contains_any(combined, AI_KEYWORDS):
-        return 'AI_AUTOMATION'
-
-    # Check for marketing
-    if contains_any(combined, ['marketing', 'campaign', 'ads', 'lead']) or \
-       contains_any(apps, SOCIAL_MEDIA_APPS):
-        return 'MARKETING'
-
-    # Check for communication
-    if contains_any(apps, COMMUNICATION_APPS) or contains_any(combined, ['message', 'chat', 'notification']):
-        return 'COMMUNICATION'
-
-    # Check for e-commerce
-    if contains_any(apps, ECOMMERCE_APPS) or contains_any(combined, ['order', 'product', 'shop', 'payment']):
-        return 'ECOMMERCE'
-
-    # Check for data sync
-    if 'sync' in combined or 'backup' in combined or 'export' in combined or 'import' in combined:
-        return 'DATA_SYNC'
-
-    # Check for productivity
-    if contains_any(apps, PROJECT_MGMT_APPS) or contains_any(combined, ['task', 'project', 'calendar', 'schedule']):
-        return 'PRODUCTIVITY'
-
-    # Check for HR
-    if contains_any(combined, ['hr', 'hiring', 'recruitment', 'employee', 'applicant']):
-        return 'HR'
-
-    # Check for customer support
-    if contains_any(combined, ['support', 'ticket', 'helpdesk', 'customer service']):
-        return 'CUSTOMER_SUPPORT'
-
-    # Check for analytics
-    if contains_any(combined, ['analytics', 'report', 'dashboard', 'metrics']):
-        return 'ANALYTICS'
-
-    # Check for development
-    if contains_any(combined, CODE_KEYWORDS) or contains_any(combined, HTTP_KEYWORDS):
-        return 'DEVELOPMENT'
-
-    # Default
-    return 'INTEGRATION'
-
-
-def determine_automation_subtype(row, automation_type):
-    """Determine secondary automation category"""
-    apps = row.get('apps_used', '').lower()
-    desc = row.get('description', '').lower()
-    name = row.get('name', '').lower()
-    combined = f"{apps} {desc} {name}"
-
-    if automation_type == 'AI_AUTOMATION':
-        if 'chatbot' in combined or 'chat' in combined:
-            return 'CHATBOT'
-        elif 'content' in combined or 'generation' in combined or 'writing' in combined:
-            return 'CONTENT_GENERATION'
-        elif 'summary' in combined or 'summarize' in combined:
-            return 'SUMMARIZATION'
-        elif 'classification' in combined or 'categoriz' in combined:
-            return 'CLASSIFICATION'
-        elif 'extraction' in combined or 'extract' in combined:
-            return 'EXTRACTION'
-        else:
-            return 'AI_PROCESSING'
-
-    elif automation_type == 'MARKETING':
-        if 'lead' in combined:
-            return 'LEAD_CAPTURE'
-        elif 'email' in combined:
-            return 'EMAIL_AUTOMATION'
-        elif 'social' in combined or 'post' in combined:
-            return 'SOCIAL_POSTING'
-        elif 'campaign' in combined:
-            return 'CAMPAIGN_MANAGEMENT'
-        else:
-            return 'MARKETING_AUTOMATION'
-
-    elif automation_type == 'DATA_SYNC':
-        if 'backup' in combined:
-            return 'DATA_BACKUP'
-        elif 'sync' in combined:
-            return 'DATA_SYNCHRONIZATION'
-        elif 'scraping' in combined or 'scrape' in combined:
-            return 'DATA_SCRAPING'
-        else:
-            return 'DATA_TRANSFER'
+MEMORY_KEYWORDS = ['memory', 'conversation', 'context', 'history']
 
-    elif automation_type == 'COMMUNICATION':
-        if 'notification' in combined or 'alert' in combined:
-            return 'NOTIFICATION'
-        elif 'message' in combined:
-            return 'MESSAGING'
-        else:
-            return 'COMMUNICATION_FLOW'
+RAG_KEYWORDS = ['vector', 'embedding', 'pinecone', 'qdrant', 'semantic']
 
-    elif automation_type == 'CUSTOMER_SUPPORT':
-        if 'ticket' in combined:
-            return 'TICKET_MANAGEMENT'
-        else:
-            return 'SUPPORT_AUTOMATION'
-
-    elif automation_type == 'PRODUCTIVITY':
-        if contains_any(apps, FORMS_APPS) or 'form' in combined:
-            return 'FORM_PROCESSING'
-        elif 'file' in combined or 'document' in combined:
-            return 'FILE_MANAGEMENT'
-        elif 'task' in combined:
-            return 'TASK_MANAGEMENT'
-        else:
-            return 'WORKFLOW_AUTOMATION'
+KEYWORD_LISTS = [
+    AI_KEYWORDS, CODE_KEYWORDS, HTTP_KEYWORDS, SPREADSHEET_APPS, EMAIL_APPS,
+    STORAGE_APPS, COMMUNICATION_APPS, CRM_APPS, SOCIAL_MEDIA_APPS,
+    ECOMMERCE_APPS, PROJECT_MGMT_APPS, FORMS_APPS, WEBHOOK_KEYWORDS,
+    SCHEDULE_KEYWORDS, REALTIME_KEYWORDS, CONDITIONAL_KEYWORDS, LOOP_KEYWORDS,
+    LLM_KEYWORDS, EMBEDDING_KEYWORDS, VISION_KEYWORDS, VOICE_KEYWORDS,
+    MEMORY_KEYWORDS, RAG_KEYWORDS
+]
 
-    else:
-        return 'GENERAL_AUTOMATION'
-
-
-def determine_primary_industry(row):
-    """Determine primary industry/use case"""
-    apps = row.get('apps_used', '').lower()
-    desc = row.get('description', '').lower()
-    name = row.get('name', '').lower()
-    combined = f"{apps} {desc} {name}"
-
-    if contains_any(combined, ['sales', 'crm', 'deal', 'pipeline']) or contains_any(apps, CRM_APPS):
-        return 'SALES'
-    elif contains_any(combined, ['marketing', 'campaign', 'lead', 'seo']) or contains_any(apps, SOCIAL_MEDIA_APPS):
-        return 'MARKETING'
-    elif contains_any(combined, ['hr', 'hiring', 'recruitment', 'employee', 'payroll']):
-        return 'HR'
-    elif contains_any(combined, ['it', 'devops', 'infrastructure', 'server']) or contains_any(combined, CODE_KEYWORDS):
-        return 'IT'
-    elif contains_any(combined, ['support', 'ticket', 'customer service', 'helpdesk']):
-        return 'CUSTOMER_SUPPORT'
-    elif contains_any(combined, ['finance', 'accounting', 'invoice', 'payment', 'expense']):
-        return 'FINANCE'
-    elif contains_any(combined, ['operations', 'inventory', 'supply chain', 'logistics']):
-        return 'OPERATIONS'
-    elif contains_any(combined, ['healthcare', 'medical', 'patient', 'health']):
-        return 'HEALTHCARE'
-    elif contains_any(combined, ['education', 'learning', 'student', 'course', 'training']):
-        return 'EDUCATION'
-    elif contains_any(apps, ECOMMERCE_APPS) or contains_any(combined, ['ecommerce', 'shop', 'order', 'product']):
-        return 'ECOMMERCE'
-    else:
-        return 'GENERAL_BUSINESS'
+# Matching lowercases only the text, never the keywords
+assert all(keyword == keyword.lower() for keywords in KEYWORD_LISTS for keyword in keywords), \
+    "keyword lists must be lowercase"
 
 
-def extract_use_case_tags(row):
-    """Extract specific use case tags"""
-    apps = row.get('apps_used', '').lower()
-    desc = row.get('description', '').lower()
-    name = row.get('name', '').lower()
-    combined = f"{apps} {desc} {name}"
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
 
-    tags = []
+def keyword_pattern(keywords):
+    """Build a regex that matches any of the keywords literally"""
+    return '|'.join(re.escape(keyword) for keyword in keywords)
 
-    # Lead generation/management
-    if 'lead' in combined:
-        if 'generat' in combined:
-            tags.append('lead-generation')
-        if 'capture' in combined:
-            tags.append('lead-capture')
-        if 'enrich' in combined or 'qualif' in combined:
-            tags.append('lead-enrichment')
 
-    # Email automation
-    if contains_any(apps, EMAIL_APPS):
-        if 'automat' in combined:
-            tags.append('email-automation')
-        if 'marketing' in combined:
-            tags.append('email-marketing')
+@lru_cache(maxsize=None)
+def compile_keywords(keywords):
+    """Compile a tuple of lowercase keywords into one alternation regex"""
+    return re.compile(keyword_pattern(keywords))
 
-    # Social media
-    if contains_any(apps, SOCIAL_MEDIA_APPS):
-        tags.append('social-media-management')
-        if 'post' in combined:
-            tags.append('content-posting')
 
-    # Data operations
-    if 'data' in combined:
-        if 'entry' in combined:
-            tags.append('data-entry')
-        if 'sync' in combined:
-            tags.append('data-sync')
-        if 'enrich' in combined:
-            tags.append('data-enrichment')
+def keyword_regex(keywords):
+    """Get the compiled regex for a keyword list"""
+    # Module-level lists are compiled at import and looked up by identity
+    regex = KEYWORD_REGEX.get(id(keywords))
+    if regex is None:
+        regex = compile_keywords(tuple(keywords))
+    return regex
 
-    # Content
-    if 'content' in combined:
-        if 'creat' in combined or 'generat' in combined:
-            tags.append('content-creation')
-        if 'publish' in combined:
-            tags.append('content-publishing')
 
-    # Forms
-    if contains_any(apps, FORMS_APPS) or 'form' in combined:
-        tags.append('form-processing')
-        if 'survey' in combined:
-            tags.append('survey-automation')
+# One regex per keyword list, keyed by the list object so lookups don't rebuild a tuple
+KEYWORD_REGEX = {id(keywords): compile_keywords(tuple(keywords)) for keywords in KEYWORD_LISTS}
 
-    # Reporting
-    if 'report' in combined or 'analytics' in combined:
-        tags.append('reporting')
-        if 'dashboard' in combined:
-            tags.append('dashboard')
 
-    # File management
-    if 'file' in combined or 'document' in combined:
-        tags.append('file-management')
-        if 'generat' in combined:
-            tags.append('document-generation')
+def contains_keywords(texts, keywords):
+    """Whether each lowercased text contains any of the keywords"""
+    return texts.str.contains(keyword_regex(keywords).pattern, regex=True).to_numpy()
 
-    # Calendar/scheduling
-    if 'calendar' in combined or 'meeting' in combined or 'appointment' in combined:
-        tags.append('calendar-management')
-        if 'schedul' in combined:
-            tags.append('meeting-scheduling')
 
-    # Customer support
-    if 'ticket' in combined:
-        tags.append('ticket-management')
-    if 'support' in combined:
-        tags.append('customer-support')
-
-    return json.dumps(tags) if tags else ''
-
-
-def determine_complexity_level(row):
-    """Determine template complexity level"""
-    app_count = count_apps(row.get('apps_used', ''))
-    apps_lower = row.get('apps_used', '').lower()
-    desc_lower = row.get('description', '').lower()
-
-    has_code = contains_any(apps_lower, CODE_KEYWORDS)
-    has_http = contains_any(apps_lower, HTTP_KEYWORDS)
-    has_webhook = 'webhook' in apps_lower or 'gateway' in apps_lower
-    has_conditional = 'if' in desc_lower or 'conditional' in desc_lower or 'filter' in desc_lower
-
-    # Calculate complexity score
-    complexity_score = 0
-    complexity_score += app_count * 10
-    if has_code: complexity_score += 30
-    if has_http: complexity_score += 20
-    if has_webhook: complexity_score += 15
-    if has_conditional: complexity_score += 10
-
-    if complexity_score <= 30:
-        return 'BEGINNER'
-    elif complexity_score <= 60:
-        return 'INTERMEDIATE'
-    elif complexity_score <= 90:
-        return 'ADVANCED'
-    else:
-        return 'EXPERT'
+def count_apps(apps_used):
+    """Count the apps in each apps_used string, split by comma or semicolon"""
+    apps = apps_used.str.split(r'[,;]', regex=True).explode().str.strip()
+    return (apps != '').groupby(level=0, sort=False).sum().to_numpy()
 
 
-def estimate_setup_time(complexity_level, app_count):
-    """Estimate setup time based on complexity"""
-    if complexity_level == 'BEGINNER' and app_count <= 2:
-        return 'UNDER_5_MIN'
-    elif complexity_level == 'BEGINNER' or (complexity_level == 'INTERMEDIATE' and app_count <= 3):
-        return '5_15_MIN'
-    elif complexity_level == 'INTERMEDIATE' or (complexity_level == 'ADVANCED' and app_count <= 4):
-        return '15_30_MIN'
-    else:
-        return '30_MIN_PLUS'
-
-
-def determine_integration_pattern(app_count, apps_used, name_desc):
-    """Determine workflow integration pattern"""
-    if app_count == 1:
-        return 'SINGLE_APP'
-    elif app_count == 2 and 'sync' in name_desc.lower():
-        return 'TWO_WAY_SYNC'
-    elif app_count >= 5:
-        # Check if hub-and-spoke (one central app with many connections)
-        return 'HUB_AND_SPOKE'
-    elif app_count >= 3:
-        return 'MULTI_STEP_WORKFLOW'
-    else:
-        return 'SIMPLE_WORKFLOW'
-
-
-def detect_trigger_type(row):
-    """Detect primary trigger type"""
-    desc = row.get('description', '').lower()
-    apps = row.get('apps_used', '').lower()
-    name = row.get('name', '').lower()
-    combined = f"{desc} {apps} {name}"
-
-    if 'webhook' in combined or 'gateway' in apps:
-        return 'WEBHOOK'
-    elif 'schedule' in combined or 'daily' in combined or 'weekly' in combined or 'cron' in combined:
-        return 'SCHEDULE'
-    elif contains_any(apps, FORMS_APPS) or 'form' in combined or 'submission' in combined:
-        return 'FORM_SUBMISSION'
-    elif contains_any(apps, EMAIL_APPS) and ('new email' in combined or 'incoming email' in combined):
-        return 'EMAIL'
-    elif 'new row' in combined or 'new record' in combined:
-        return 'NEW_ROW'
-    elif 'file' in combined or 'upload' in combined:
-        return 'FILE_UPLOAD'
-    elif 'message' in combined or contains_any(apps, COMMUNICATION_APPS):
-        return 'MESSAGE'
-    elif 'manual' in combined:
-        return 'MANUAL'
-    else:
-        return 'WATCH'
-
-
-def detect_action_type(row):
-    """Detect primary action type"""
-    desc = row.get('description', '').lower()
-    apps = row.get('apps_used', '').lower()
-    name = row.get('name', '').lower()
-    combined = f"{desc} {apps} {name}"
-
-    if 'create' in combined or 'add' in combined:
-        return 'CREATE_RECORD'
-    elif 'update' in combined or 'edit' in combined:
-        return 'UPDATE_DATA'
-    elif 'send' in combined and contains_any(apps, EMAIL_APPS):
-        return 'SEND_EMAIL'
-    elif 'send' in combined or 'post' in combined and contains_any(apps, COMMUNICATION_APPS):
-        return 'SEND_MESSAGE'
-    elif 'generate' in combined or 'create content' in combined:
-        return 'GENERATE_CONTENT'
-    elif 'post' in combined and contains_any(apps, SOCIAL_MEDIA_APPS):
-        return 'POST_SOCIAL'
-    elif 'file' in combined:
-        return 'CREATE_FILE'
-    elif 'analyze' in combined or 'report' in combined:
-        return 'ANALYZE_DATA'
-    else:
-        return 'PROCESS_DATA'
+def parse_ints(values):
+    """Parse integer fields into a float64 array, NaN where empty or not an integer"""
+    # to_numeric also accepts decimals and exponents, which int() rejects
+    is_int = values.str.fullmatch(r'\s*[+-]?\d+\s*').to_numpy(dtype=bool)
+    numbers = pd.to_numeric(values.where(is_int, ''), errors='coerce')
+    return np.asarray(numbers, dtype=np.float64)
 
 
-def detect_ai_use_case(row):
-    """Detect AI-specific use case"""
-    desc = row.get('description', '').lower()
-    apps = row.get('apps_used', '').lower()
-    name = row.get('name', '').lower()
-    combined = f"{desc} {apps} {name}"
+def calculate_percentiles(sorted_values, targets):
+    """Percentile of each target among the sorted values; NaN targets give NaN"""
+    if len(sorted_values) == 0:
+        return np.full(len(targets), np.nan)
+    smaller_counts = np.searchsorted(sorted_values, targets, side='right')
+    return np.where(np.isnan(targets), np.nan, (smaller_counts / len(sorted_values)) * 100)
+
+
+# ============================================================================
+# PER-TEMPLATE CATEGORIZATION
+# ============================================================================
+# enrich_dataframe maps these over the templates. Texts passed to them are
+# already lowercased; desc_apps_name is "description apps name".
 
+def detect_ai_use_case(desc_apps_name):
+    """Detect AI-specific use case"""
+    combined = desc_apps_name
     if 'chatbot' in combined or 'chat' in combined:
         return 'CHATBOT'
     elif 'content' in combined or 'writing' in combined or 'blog' in combined:
@@ -467,9 +192,8 @@ def detect_ai_use_case(row):
         return 'AI_PROCESSING'
 
 
-def detect_ai_provider(apps_used):
+def detect_ai_provider(apps_lower):
     """Detect AI provider"""
-    apps_lower = apps_used.lower()
 
     providers = []
     if 'openai' in apps_lower or 'gpt' in apps_lower or 'chatgpt' in apps_lower:
@@ -487,218 +211,661 @@ def detect_ai_provider(apps_used):
         return 'OTHER'
 
 
-def determine_target_company_size(row, complexity_level):
-    """Determine target company size"""
-    apps = row.get('apps_used', '').lower()
-    desc = row.get('description', '').lower()
-    combined = f"{apps} {desc}"
+def extract_business_value_tags(automation_type, complexity_level):
+    """Tag the business value of an automation"""
+    value_tags = []
+    if automation_type in ['AI_AUTOMATION', 'MARKETING', 'PRODUCTIVITY']:
+        value_tags.append('time-savings')
+    if automation_type in ['MARKETING', 'SALES', 'ECOMMERCE']:
+        value_tags.append('revenue-generation')
+    if automation_type in ['DATA_SYNC', 'INTEGRATION']:
+        value_tags.append('process-optimization')
+    if complexity_level in ['BEGINNER', 'INTERMEDIATE']:
+        value_tags.append('easy-to-implement')
+    return value_tags
 
-    # Enterprise indicators
-    enterprise_apps = ['salesforce', 'workday', 'sap', 'oracle', 'servicenow']
-    if contains_any(combined, enterprise_apps):
-        return 'ENTERPRISE'
 
-    # SMB indicators
-    smb_apps = ['quickbooks', 'xero', 'mailchimp']
-    if contains_any(combined, smb_apps):
-        return 'SMB'
+WORD_REGEX = re.compile(r'\b\w+\b')
+KEYWORD_STOPWORDS = frozenset(['and', 'the', 'a', 'to', 'from', 'with', 'for', 'in', 'on', 'at', 'of'])
 
-    # Solopreneur indicators
-    if complexity_level == 'BEGINNER' and count_apps(row.get('apps_used', '')) <= 2:
-        return 'SOLOPRENEUR'
 
-    # Default based on complexity
-    if complexity_level in ['BEGINNER', 'INTERMEDIATE']:
-        return 'SMB'
-    elif complexity_level == 'ADVANCED':
-        return 'MIDMARKET'
-    else:
-        return 'ALL'
+def keyword_terms(name_words):
+    """Keep the first ten words of a name that are long enough and not stopwords"""
+    return [w for w in name_words if len(w) > 3 and w not in KEYWORD_STOPWORDS][:10]
 
 
-def estimate_time_saved(automation_type, complexity_level, app_count):
-    """Estimate time saved per week"""
-    # Base time savings
-    base_savings = {
-        'BEGINNER': 1,
-        'INTERMEDIATE': 3,
-        'ADVANCED': 8,
-        'EXPERT': 15
-    }
+# ============================================================================
+# COLUMN-WISE CATEGORIZATION
+# ============================================================================
+# Each function below classifies every template at once. If/elif rules are
+# np.select conditions listed in priority order, so the first one that
+# matches wins. Texts are lowercased Series and flags are the boolean arrays
+# from enrich_dataframe.
+
+def determine_automation_types(combined, flags):
+    """Determine the primary automation type of every template"""
+    conditions = [
+        flags['is_ai_powered'],
+        contains_keywords(combined, ['marketing', 'campaign', 'ads', 'lead']) | flags['uses_social_media'],
+        flags['uses_communication'] | contains_keywords(combined, ['message', 'chat', 'notification']),
+        flags['uses_ecommerce'] | contains_keywords(combined, ['order', 'product', 'shop', 'payment']),
+        contains_keywords(combined, ['sync', 'backup', 'export', 'import']),
+        flags['uses_project_mgmt'] | contains_keywords(combined, ['task', 'project', 'calendar', 'schedule']),
+        contains_keywords(combined, ['hr', 'hiring', 'recruitment', 'employee', 'applicant']),
+        contains_keywords(combined, ['support', 'ticket', 'helpdesk', 'customer service']),
+        contains_keywords(combined, ['analytics', 'report', 'dashboard', 'metrics']),
+        contains_keywords(combined, CODE_KEYWORDS) | contains_keywords(combined, HTTP_KEYWORDS),
+    ]
+    choices = [
+        'AI_AUTOMATION', 'MARKETING', 'COMMUNICATION', 'ECOMMERCE', 'DATA_SYNC',
+        'PRODUCTIVITY', 'HR', 'CUSTOMER_SUPPORT', 'ANALYTICS', 'DEVELOPMENT'
+    ]
+    return np.select(conditions, choices, default='INTEGRATION')
+
+
+def determine_automation_subtypes(combined, automation_type, flags):
+    """Determine the secondary automation category of every template"""
+    ai = automation_type == 'AI_AUTOMATION'
+    marketing = automation_type == 'MARKETING'
+    data_sync = automation_type == 'DATA_SYNC'
+    communication = automation_type == 'COMMUNICATION'
+    support = automation_type == 'CUSTOMER_SUPPORT'
+    productivity = automation_type == 'PRODUCTIVITY'
+    conditions = [
+        ai & contains_keywords(combined, ['chatbot', 'chat']),
+        ai & contains_keywords(combined, ['content', 'generation', 'writing']),
+        ai & contains_keywords(combined, ['summary', 'summarize']),
+        ai & contains_keywords(combined, ['classification', 'categoriz']),
+        ai & contains_keywords(combined, ['extraction', 'extract']),
+        ai,
+        marketing & contains_keywords(combined, ['lead']),
+        marketing & contains_keywords(combined, ['email']),
+        marketing & contains_keywords(combined, ['social', 'post']),
+        marketing & contains_keywords(combined, ['campaign']),
+        marketing,
+        data_sync & contains_keywords(combined, ['backup']),
+        data_sync & contains_keywords(combined, ['sync']),
+        data_sync & contains_keywords(combined, ['scraping', 'scrape']),
+        data_sync,
+        communication & contains_keywords(combined, ['notification', 'alert']),
+        communication & contains_keywords(combined, ['message']),
+        communication,
+        support & contains_keywords(combined, ['ticket']),
+        support,
+        productivity & (flags['uses_forms'] | contains_keywords(combined, ['form'])),
+        productivity & contains_keywords(combined, ['file', 'document']),
+        productivity & contains_keywords(combined, ['task']),
+        productivity,
+    ]
+    choices = [
+        'CHATBOT', 'CONTENT_GENERATION', 'SUMMARIZATION', 'CLASSIFICATION', 'EXTRACTION', 'AI_PROCESSING',
+        'LEAD_CAPTURE', 'EMAIL_AUTOMATION', 'SOCIAL_POSTING', 'CAMPAIGN_MANAGEMENT', 'MARKETING_AUTOMATION',
+        'DATA_BACKUP', 'DATA_SYNCHRONIZATION', 'DATA_SCRAPING', 'DATA_TRANSFER',
+        'NOTIFICATION', 'MESSAGING', 'COMMUNICATION_FLOW',
+        'TICKET_MANAGEMENT', 'SUPPORT_AUTOMATION',
+        'FORM_PROCESSING', 'FILE_MANAGEMENT', 'TASK_MANAGEMENT', 'WORKFLOW_AUTOMATION'
+    ]
+    return np.select(conditions, choices, default='GENERAL_AUTOMATION')
+
+
+def determine_primary_industries(combined, flags):
+    """Determine the primary industry/use case of every template"""
+    conditions = [
+        contains_keywords(combined, ['sales', 'crm', 'deal', 'pipeline']) | flags['uses_crm'],
+        contains_keywords(combined, ['marketing', 'campaign', 'lead', 'seo']) | flags['uses_social_media'],
+        contains_keywords(combined, ['hr', 'hiring', 'recruitment', 'employee', 'payroll']),
+        contains_keywords(combined, ['it', 'devops', 'infrastructure', 'server']) | contains_keywords(combined, CODE_KEYWORDS),
+        contains_keywords(combined, ['support', 'ticket', 'customer service', 'helpdesk']),
+        contains_keywords(combined, ['finance', 'accounting', 'invoice', 'payment', 'expense']),
+        contains_keywords(combined, ['operations', 'inventory', 'supply chain', 'logistics']),
+        contains_keywords(combined, ['healthcare', 'medical', 'patient', 'health']),
+        contains_keywords(combined, ['education', 'learning', 'student', 'course', 'training']),
+        flags['uses_ecommerce'] | contains_keywords(combined, ['ecommerce', 'shop', 'order', 'product']),
+    ]
+    choices = [
+        'SALES', 'MARKETING', 'HR', 'IT', 'CUSTOMER_SUPPORT', 'FINANCE',
+        'OPERATIONS', 'HEALTHCARE', 'EDUCATION', 'ECOMMERCE'
+    ]
+    return np.select(conditions, choices, default='GENERAL_BUSINESS')
+
+
+def detect_trigger_types(desc_apps_name, apps, flags):
+    """Detect the primary trigger type of every template"""
+    conditions = [
+        contains_keywords(desc_apps_name, ['webhook']) | contains_keywords(apps, ['gateway']),
+        contains_keywords(desc_apps_name, ['schedule', 'daily', 'weekly', 'cron']),
+        flags['uses_forms'] | contains_keywords(desc_apps_name, ['form', 'submission']),
+        flags['uses_email'] & contains_keywords(desc_apps_name, ['new email', 'incoming email']),
+        contains_keywords(desc_apps_name, ['new row', 'new record']),
+        contains_keywords(desc_apps_name, ['file', 'upload']),
+        contains_keywords(desc_apps_name, ['message']) | flags['uses_communication'],
+        contains_keywords(desc_apps_name, ['manual']),
+    ]
+    choices = [
+        'WEBHOOK', 'SCHEDULE', 'FORM_SUBMISSION', 'EMAIL', 'NEW_ROW',
+        'FILE_UPLOAD', 'MESSAGE', 'MANUAL'
+    ]
+    return np.select(conditions, choices, default='WATCH')
+
+
+def detect_action_types(desc_apps_name, flags):
+    """Detect the primary action type of every template"""
+    has_send = contains_keywords(desc_apps_name, ['send'])
+    has_post = contains_keywords(desc_apps_name, ['post'])
+    conditions = [
+        contains_keywords(desc_apps_name, ['create', 'add']),
+        contains_keywords(desc_apps_name, ['update', 'edit']),
+        has_send & flags['uses_email'],
+        has_send | (has_post & flags['uses_communication']),
+        contains_keywords(desc_apps_name, ['generate', 'create content']),
+        has_post & flags['uses_social_media'],
+        contains_keywords(desc_apps_name, ['file']),
+        contains_keywords(desc_apps_name, ['analyze', 'report']),
+    ]
+    choices = [
+        'CREATE_RECORD', 'UPDATE_DATA', 'SEND_EMAIL', 'SEND_MESSAGE',
+        'GENERATE_CONTENT', 'POST_SOCIAL', 'CREATE_FILE', 'ANALYZE_DATA'
+    ]
+    return np.select(conditions, choices, default='PROCESS_DATA')
+
+
+# Each use case rule is a bit in one hit mask per template: a keyword found in
+# the combined text or an app category flag
+USE_CASE_KEYWORDS = [
+    'lead', 'generat', 'capture', 'enrich', 'qualif', 'automat', 'marketing', 'post',
+    'data', 'entry', 'sync', 'content', 'creat', 'publish', 'form', 'survey', 'report',
+    'analytics', 'dashboard', 'file', 'document', 'calendar', 'meeting', 'appointment',
+    'schedul', 'ticket', 'support'
+]
+USE_CASE_FLAGS = ['uses_email', 'uses_social_media', 'uses_forms']
+USE_CASE_BITS = {term: 1 << bit for bit, term in enumerate(USE_CASE_KEYWORDS + USE_CASE_FLAGS)}
 
-    time_value = base_savings.get(complexity_level, 3)
 
-    # Adjust for automation type
-    if automation_type in ['AI_AUTOMATION', 'MARKETING', 'CUSTOMER_SUPPORT']:
-        time_value *= 1.5
-    elif automation_type in ['DATA_SYNC', 'INTEGRATION']:
-        time_value *= 1.2
+def use_case_mask(*terms):
+    """Bits of the terms, any of which satisfies a rule condition"""
+    mask = 0
+    for term in terms:
+        mask |= USE_CASE_BITS[term]
+    return mask
 
-    # Adjust for number of apps (more apps = more time saved)
-    if app_count >= 5:
-        time_value *= 1.3
 
-    if time_value < 1:
-        return 'UNDER_1HR_WEEK'
-    elif time_value < 5:
-        return '1_5HR_WEEK'
-    elif time_value < 20:
-        return '5_20HR_WEEK'
-    else:
-        return '20HR_PLUS_WEEK'
+# Tags in the order they are listed; a tag applies when every one of its
+# conditions has at least one of its terms set
+USE_CASE_RULES = [
+    # Lead generation/management
+    ('lead-generation', [use_case_mask('lead'), use_case_mask('generat')]),
+    ('lead-capture', [use_case_mask('lead'), use_case_mask('capture')]),
+    ('lead-enrichment', [use_case_mask('lead'), use_case_mask('enrich', 'qualif')]),
+    # Email automation
+    ('email-automation', [use_case_mask('uses_email'), use_case_mask('automat')]),
+    ('email-marketing', [use_case_mask('uses_email'), use_case_mask('marketing')]),
+    # Social media
+    ('social-media-management', [use_case_mask('uses_social_media')]),
+    ('content-posting', [use_case_mask('uses_social_media'), use_case_mask('post')]),
+    # Data operations
+    ('data-entry', [use_case_mask('data'), use_case_mask('entry')]),
+    ('data-sync', [use_case_mask('data'), use_case_mask('sync')]),
+    ('data-enrichment', [use_case_mask('data'), use_case_mask('enrich')]),
+    # Content
+    ('content-creation', [use_case_mask('content'), use_case_mask('creat', 'generat')]),
+    ('content-publishing', [use_case_mask('content'), use_case_mask('publish')]),
+    # Forms
+    ('form-processing', [use_case_mask('uses_forms', 'form')]),
+    ('survey-automation', [use_case_mask('uses_forms', 'form'), use_case_mask('survey')]),
+    # Reporting
+    ('reporting', [use_case_mask('report', 'analytics')]),
+    ('dashboard', [use_case_mask('report', 'analytics'), use_case_mask('dashboard')]),
+    # File management
+    ('file-management', [use_case_mask('file', 'document')]),
+    ('document-generation', [use_case_mask('file', 'document'), use_case_mask('generat')]),
+    # Calendar/scheduling
+    ('calendar-management', [use_case_mask('calendar', 'meeting', 'appointment')]),
+    ('meeting-scheduling', [use_case_mask('calendar', 'meeting', 'appointment'), use_case_mask('schedul')]),
+    # Customer support
+    ('ticket-management', [use_case_mask('ticket')]),
+    ('customer-support', [use_case_mask('support')]),
+]
+
+
+def extract_use_case_tags(combined, flags):
+    """Extract the use case tags of every template
+
+    Each keyword is searched for once over the whole column and recorded as a
+    bit, and every rule is then a few integer ANDs on the hit masks.
+    """
+    hits = np.zeros(len(combined), dtype=np.uint32)
+    for keyword in USE_CASE_KEYWORDS:
+        hits |= contains_keywords(combined, [keyword]).astype(np.uint32) * USE_CASE_BITS[keyword]
+    for flag in USE_CASE_FLAGS:
+        hits |= flags[flag].astype(np.uint32) * USE_CASE_BITS[flag]
+
+    applies = np.column_stack([
+        np.logical_and.reduce([(hits & condition) != 0 for condition in conditions])
+        for _, conditions in USE_CASE_RULES
+    ])
+    tags = [tag for tag, _ in USE_CASE_RULES]
+    return [list(compress(tags, row)) for row in applies.tolist()]
+
+
+def parse_node_counts(nodes_used, app_count):
+    """Use the reported node counts, or estimate them from the app counts"""
+    # Checked with a regex rather than caught, so bad values cost no exception
+    nodes = parse_ints(nodes_used)
+    return np.where(np.isnan(nodes), np.maximum(app_count, 1), nodes).astype(np.int64)
+
+
+# Popularity tiers and engagement scores, from the highest percentile threshold down
+POPULARITY_TIERS = [(99, 'VIRAL', 95), (90, 'POPULAR', 80), (50, 'MODERATE', 50), (0, 'NICHE', 20)]
+
+
+def determine_popularity_tiers(total_views, usage_count, all_views, all_usage):
+    """Rank views (or usage) against all templates; returns (tiers, engagement scores)
+
+    all_views and all_usage are the sorted arrays of every parsed count.
+    """
+    views = parse_ints(total_views)
+    usage = parse_ints(usage_count)
+
+    # Views take precedence whenever present, even if they don't parse
+    percentile = np.where(
+        (total_views != '').to_numpy(),
+        calculate_percentiles(all_views, views),
+        calculate_percentiles(all_usage, usage)
+    )
+
+    # NaN percentiles fail every comparison and fall through to UNKNOWN
+    conditions = [percentile >= threshold for threshold, _, _ in POPULARITY_TIERS]
+    tiers = np.select(conditions, [tier for _, tier, _ in POPULARITY_TIERS], default='UNKNOWN')
+    scores = np.select(conditions, [score for _, _, score in POPULARITY_TIERS], default=0)
+    return tiers, scores
+
+
+# Complexity levels and weekly time saved, with the upper score bound of every
+# level but the last
+COMPLEXITY_LEVELS = np.array(['BEGINNER', 'INTERMEDIATE', 'ADVANCED', 'EXPERT'])
+COMPLEXITY_BOUNDS = [30, 60, 90]
+TIME_SAVED_BUCKETS = np.array(['UNDER_1HR_WEEK', '1_5HR_WEEK', '5_20HR_WEEK', '20HR_PLUS_WEEK'])
+TIME_SAVED_BOUNDS = [1, 5, 20]
+BASE_TIME_SAVED = {'BEGINNER': 1, 'INTERMEDIATE': 3, 'ADVANCED': 8, 'EXPERT': 15}
+
+
+def determine_complexity_levels(app_count, apps, desc, has_code, has_webhook):
+    """Determine the complexity level of every template from a weighted score"""
+    complexity_score = (
+        app_count * 10
+        + has_code * 30
+        + contains_keywords(apps, HTTP_KEYWORDS) * 20
+        + has_webhook * 15
+        + contains_keywords(desc, ['if', 'conditional', 'filter']) * 10
+    )
+    # Scores on a bound belong to the lower level
+    return COMPLEXITY_LEVELS[np.searchsorted(COMPLEXITY_BOUNDS, complexity_score, side='left')]
+
+
+def estimate_times_saved(automation_type, complexity_level, app_count):
+    """Estimate the time every template saves per week"""
+    time_value = pd.Series(complexity_level).map(BASE_TIME_SAVED).fillna(3).to_numpy(dtype=np.float64)
+    time_value = time_value * np.select(
+        [
+            np.isin(automation_type, ['AI_AUTOMATION', 'MARKETING', 'CUSTOMER_SUPPORT']),
+            np.isin(automation_type, ['DATA_SYNC', 'INTEGRATION']),
+        ],
+        [1.5, 1.2],
+        default=1.0
+    )
+    time_value = np.where(app_count >= 5, time_value * 1.3, time_value)
+    # Values on a bound belong to the higher bucket
+    return TIME_SAVED_BUCKETS[np.searchsorted(TIME_SAVED_BOUNDS, time_value, side='right')]
+
+
+def estimate_setup_times(complexity_level, app_count):
+    """Estimate setup time from complexity and app count"""
+    beginner = complexity_level == 'BEGINNER'
+    intermediate = complexity_level == 'INTERMEDIATE'
+    return np.select(
+        [
+            beginner & (app_count <= 2),
+            beginner | (intermediate & (app_count <= 3)),
+            intermediate | ((complexity_level == 'ADVANCED') & (app_count <= 4)),
+        ],
+        ['UNDER_5_MIN', '5_15_MIN', '15_30_MIN'],
+        default='30_MIN_PLUS'
+    )
+
+
+def determine_integration_patterns(app_count, desc_name):
+    """Determine the workflow integration pattern of every template"""
+    return np.select(
+        [
+            app_count == 1,
+            (app_count == 2) & desc_name.str.contains('sync', regex=False).to_numpy(),
+            app_count >= 5,
+            app_count >= 3,
+        ],
+        ['SINGLE_APP', 'TWO_WAY_SYNC', 'HUB_AND_SPOKE', 'MULTI_STEP_WORKFLOW'],
+        default='SIMPLE_WORKFLOW'
+    )
+
+
+def determine_target_company_sizes(apps_desc, complexity_level, app_count):
+    """Determine the target company size of every template"""
+    beginner = complexity_level == 'BEGINNER'
+    return np.select(
+        [
+            # Enterprise and SMB indicators
+            contains_keywords(apps_desc, ['salesforce', 'workday', 'sap', 'oracle', 'servicenow']),
+            contains_keywords(apps_desc, ['quickbooks', 'xero', 'mailchimp']),
+            # Solopreneur indicators
+            beginner & (app_count <= 2),
+            # Default based on complexity
+            beginner | (complexity_level == 'INTERMEDIATE'),
+            complexity_level == 'ADVANCED',
+        ],
+        ['ENTERPRISE', 'SMB', 'SOLOPRENEUR', 'SMB', 'MIDMARKET'],
+        default='ALL'
+    )
+
+
+def determine_trending_potentials(is_ai_powered, popularity_tier):
+    """Rate trending potential from AI usage and popularity"""
+    is_ai = np.asarray(is_ai_powered, dtype=bool)
+    is_popular = np.isin(popularity_tier, ['VIRAL', 'POPULAR'])
+    return np.select([is_ai & is_popular, is_ai | is_popular], ['HIGH', 'MEDIUM'], default='LOW')
 
 
 # ============================================================================
-# MAIN ENRICHMENT FUNCTION
+# OUTPUT CATEGORIES
 # ============================================================================
+# Every value each low-cardinality output column can take, so the typed
+# Parquet copy stores them as small integer codes. Free-form tag and keyword
+# columns are lists instead: JSON text in the CSV, list columns in Parquet.
+
+TAG_COLUMNS = ['use_case_tags', 'business_value_tags', 'keywords']
+
+# Boolean columns packed into the uint32 flags column, bit i for FLAG_COLUMNS[i]
+FLAG_COLUMNS = [
+    'requires_coding', 'is_ai_powered', 'is_webhook_based', 'is_scheduled', 'is_realtime',
+    'has_conditional_logic', 'has_loops', 'uses_llm', 'uses_embeddings', 'uses_vision',
+    'uses_voice', 'has_memory', 'uses_spreadsheet', 'uses_email', 'uses_storage',
+    'uses_communication', 'uses_crm', 'uses_social_media', 'uses_ecommerce',
+    'uses_project_mgmt', 'uses_forms', 'has_rag'
+]
 
-def enrich_template(row, all_views, all_usage):
-    """Enrich a single template with new categorization columns"""
-    enriched = row.copy()
 
-    # Parse existing fields
-    apps_used = row.get('apps_used', '')
-    description = row.get('description', '')
-    name = row.get('name', '')
-    total_views = row.get('total_views', '')
-    usage_count = row.get('usage_count', '')
-    nodes_used = row.get('nodes_used', '')
+def pack_flags(columns):
+    """Pack the FLAG_COLUMNS boolean arrays of a column dict into one uint32 array"""
+    flags = np.zeros(len(columns[FLAG_COLUMNS[0]]), dtype=np.uint32)
+    for bit, col in enumerate(FLAG_COLUMNS):
+        flags |= np.asarray(columns[col], dtype=np.uint32) << np.uint32(bit)
+    return flags
+
+
+OUTPUT_CATEGORIES = {
+    'automation_type': pd.CategoricalDtype([
+        'AI_AUTOMATION', 'MARKETING', 'COMMUNICATION', 'ECOMMERCE', 'DATA_SYNC',
+        'PRODUCTIVITY', 'HR', 'CUSTOMER_SUPPORT', 'ANALYTICS', 'DEVELOPMENT', 'INTEGRATION'
+    ]),
+    'automation_subtype': pd.CategoricalDtype([
+        'CHATBOT', 'CONTENT_GENERATION', 'SUMMARIZATION', 'CLASSIFICATION', 'EXTRACTION',
+        'AI_PROCESSING', 'LEAD_CAPTURE', 'EMAIL_AUTOMATION', 'SOCIAL_POSTING',
+        'CAMPAIGN_MANAGEMENT', 'MARKETING_AUTOMATION', 'DATA_BACKUP', 'DATA_SYNCHRONIZATION',
+        'DATA_SCRAPING', 'DATA_TRANSFER', 'NOTIFICATION', 'MESSAGING', 'COMMUNICATION_FLOW',
+        'TICKET_MANAGEMENT', 'SUPPORT_AUTOMATION', 'FORM_PROCESSING', 'FILE_MANAGEMENT',
+        'TASK_MANAGEMENT', 'WORKFLOW_AUTOMATION', 'GENERAL_AUTOMATION'
+    ]),
+    'primary_industry': pd.CategoricalDtype([
+        'SALES', 'MARKETING', 'HR', 'IT', 'CUSTOMER_SUPPORT', 'FINANCE', 'OPERATIONS',
+        'HEALTHCARE', 'EDUCATION', 'ECOMMERCE', 'GENERAL_BUSINESS'
+    ]),
+    'complexity_level': pd.CategoricalDtype(COMPLEXITY_LEVELS),
+    'estimated_setup_time': pd.CategoricalDtype(['UNDER_5_MIN', '5_15_MIN', '15_30_MIN', '30_MIN_PLUS']),
+    'integration_pattern': pd.CategoricalDtype([
+        'SINGLE_APP', 'TWO_WAY_SYNC', 'HUB_AND_SPOKE', 'MULTI_STEP_WORKFLOW', 'SIMPLE_WORKFLOW'
+    ]),
+    'primary_trigger_type': pd.CategoricalDtype([
+        'WEBHOOK', 'SCHEDULE', 'FORM_SUBMISSION', 'EMAIL', 'NEW_ROW', 'FILE_UPLOAD',
+        'MESSAGE', 'MANUAL', 'WATCH'
+    ]),
+    'primary_action_type': pd.CategoricalDtype([
+        'CREATE_RECORD', 'UPDATE_DATA', 'SEND_EMAIL', 'SEND_MESSAGE', 'GENERATE_CONTENT',
+        'POST_SOCIAL', 'CREATE_FILE', 'ANALYZE_DATA', 'PROCESS_DATA'
+    ]),
+    'popularity_tier': pd.CategoricalDtype([tier for _, tier, _ in POPULARITY_TIERS] + ['UNKNOWN']),
+    'trending_potential': pd.CategoricalDtype(['HIGH', 'MEDIUM', 'LOW']),
+    # Templates that aren't AI-powered have no AI use case or provider
+    'ai_use_case': pd.CategoricalDtype([
+        '', 'CHATBOT', 'CONTENT_GENERATION', 'SUMMARIZATION', 'CLASSIFICATION', 'EXTRACTION',
+        'TRANSLATION', 'SENTIMENT_ANALYSIS', 'IMAGE_GENERATION', 'TRANSCRIPTION',
+        'EMBEDDINGS_SEARCH', 'AI_PROCESSING'
+    ]),
+    'ai_provider': pd.CategoricalDtype(['', 'OPENAI', 'ANTHROPIC', 'GOOGLE', 'MULTIPLE', 'OTHER']),
+    'target_company_size': pd.CategoricalDtype(['ENTERPRISE', 'MIDMARKET', 'SMB', 'SOLOPRENEUR', 'ALL']),
+    'estimated_time_saved': pd.CategoricalDtype(TIME_SAVED_BUCKETS),
+}
 
-    # Calculate app count
-    app_count = count_apps(apps_used)
-    enriched['app_count'] = app_count
 
-    # Calculate node count (use existing or estimate)
-    try:
-        node_count = int(nodes_used) if nodes_used else max(app_count, 1)
-    except:
-        node_count = max(app_count, 1)
-    enriched['node_count'] = node_count
-
-    # Core categorization
-    automation_type = determine_automation_type(row)
-    enriched['automation_type'] = automation_type
-    enriched['automation_subtype'] = determine_automation_subtype(row, automation_type)
-    enriched['primary_industry'] = determine_primary_industry(row)
-    enriched['use_case_tags'] = extract_use_case_tags(row)
-
-    # Complexity
-    complexity_level = determine_complexity_level(row)
-    enriched['complexity_level'] = complexity_level
-    enriched['estimated_setup_time'] = estimate_setup_time(complexity_level, app_count)
-    enriched['requires_coding'] = contains_any(apps_used, CODE_KEYWORDS)
-    enriched['requires_api_keys'] = app_count > 0  # Most integrations need API keys
-
-    # Technology flags
-    enriched['is_ai_powered'] = contains_any(f"{apps_used} {description} {name}", AI_KEYWORDS)
-    enriched['is_webhook_based'] = 'webhook' in apps_used.lower() or 'gateway' in apps_used.lower()
-    enriched['is_scheduled'] = contains_any(f"{description} {name}", ['schedule', 'daily', 'weekly', 'cron', 'recurring'])
-    enriched['is_realtime'] = contains_any(f"{description} {name}", ['real-time', 'instant', 'immediately', 'watch'])
-    enriched['has_conditional_logic'] = contains_any(f"{description} {name}", ['if', 'conditional', 'filter', 'branch', 'router'])
-    enriched['has_loops'] = contains_any(f"{description} {name}", ['loop', 'iterate', 'repeat', 'for each'])
-    enriched['uses_llm'] = contains_any(apps_used, ['llm', 'language model', 'chat model', 'completion'])
-    enriched['uses_embeddings'] = contains_any(apps_used, ['embedding', 'vector', 'pinecone', 'qdrant', 'weaviate'])
-    enriched['uses_vision'] = contains_any(f"{apps_used} {description}", ['image generation', 'dall-e', 'vision', 'image analysis', 'stable diffusion'])
-    enriched['uses_voice'] = contains_any(f"{apps_used} {description}", ['whisper', 'voice', 'audio', 'transcribe', 'speech', 'eleven'])
-    enriched['has_memory'] = contains_any(apps_used, ['memory', 'conversation', 'context', 'history'])
-
-    # App category flags
-    enriched['uses_spreadsheet'] = contains_any(apps_used, SPREADSHEET_APPS)
-    enriched['uses_email'] = contains_any(apps_used, EMAIL_APPS)
-    enriched['uses_storage'] = contains_any(apps_used, STORAGE_APPS)
-    enriched['uses_communication'] = contains_any(apps_used, COMMUNICATION_APPS)
-    enriched['uses_crm'] = contains_any(apps_used, CRM_APPS)
-    enriched['uses_social_media'] = contains_any(apps_used, SOCIAL_MEDIA_APPS)
-    enriched['uses_ecommerce'] = contains_any(apps_used, ECOMMERCE_APPS)
-    enriched['uses_project_mgmt'] = contains_any(apps_used, PROJECT_MGMT_APPS)
-    enriched['uses_forms'] = contains_any(apps_used, FORMS_APPS)
-
-    # Integration pattern and triggers
-    enriched['integration_pattern'] = determine_integration_pattern(app_count, apps_used, f"{name} {description}")
-    enriched['primary_trigger_type'] = detect_trigger_type(row)
-    enriched['primary_action_type'] = detect_action_type(row)
-
-    # Popularity metrics
-    try:
-        if total_views:
-            views_val = int(total_views)
-            percentile = calculate_percentile(all_views, views_val)
-        elif usage_count:
-            usage_val = int(usage_count)
-            percentile = calculate_percentile(all_usage, usage_val)
-        else:
-            percentile = None
-
-        if percentile is not None:
-            if percentile >= 99:
-                enriched['popularity_tier'] = 'VIRAL'
-                enriched['engagement_score'] = 95
-            elif percentile >= 90:
-                enriched['popularity_tier'] = 'POPULAR'
-                enriched['engagement_score'] = 80
-            elif percentile >= 50:
-                enriched['popularity_tier'] = 'MODERATE'
-                enriched['engagement_score'] = 50
-            else:
-                enriched['popularity_tier'] = 'NICHE'
-                enriched['engagement_score'] = 20
-        else:
-            enriched['popularity_tier'] = 'UNKNOWN'
-            enriched['engagement_score'] = 0
-    except:
-        enriched['popularity_tier'] = 'UNKNOWN'
-        enriched['engagement_score'] = 0
-
-    # Trending potential
-    is_ai = enriched['is_ai_powered']
-    is_popular = enriched['popularity_tier'] in ['VIRAL', 'POPULAR']
-    if is_ai and is_popular:
-        enriched['trending_potential'] = 'HIGH'
-    elif is_ai or is_popular:
-        enriched['trending_potential'] = 'MEDIUM'
-    else:
-        enriched['trending_potential'] = 'LOW'
+# ============================================================================
+# MAIN ENRICHMENT FUNCTION
+# ============================================================================
 
-    # AI-specific fields
-    if enriched['is_ai_powered']:
-        enriched['ai_use_case'] = detect_ai_use_case(row)
-        enriched['ai_provider'] = detect_ai_provider(apps_used)
-        enriched['has_rag'] = contains_any(apps_used, ['vector', 'embedding', 'pinecone', 'qdrant', 'semantic'])
-    else:
-        enriched['ai_use_case'] = ''
-        enriched['ai_provider'] = ''
-        enriched['has_rag'] = False
+def enrich_dataframe(df, all_views, all_usage):
+    """Enrich every template at once.
+
+    Keyword flags and most categories are computed column-wise; the
+    remaining fields go through the per-template helpers.
+    """
+    # Lowercase each text column once and build the combined texts the flags search
+    apps = df['apps_used'].str.lower()
+    desc = df['description'].str.lower()
+    name = df['name'].str.lower()
+    combined = apps + ' ' + desc + ' ' + name
+    desc_name = desc + ' ' + name
+    apps_desc = apps + ' ' + desc
+    # Trigger and action detection read the fields in this order
+    desc_apps_name = desc + ' ' + apps + ' ' + name
+
+    flags = {
+        # Technology flags
+        'is_ai_powered': contains_keywords(combined, AI_KEYWORDS),
+        'is_webhook_based': contains_keywords(apps, WEBHOOK_KEYWORDS),
+        'is_scheduled': contains_keywords(desc_name, SCHEDULE_KEYWORDS),
+        'is_realtime': contains_keywords(desc_name, REALTIME_KEYWORDS),
+        'has_conditional_logic': contains_keywords(desc_name, CONDITIONAL_KEYWORDS),
+        'has_loops': contains_keywords(desc_name, LOOP_KEYWORDS),
+        'uses_llm': contains_keywords(apps, LLM_KEYWORDS),
+        'uses_embeddings': contains_keywords(apps, EMBEDDING_KEYWORDS),
+        'uses_vision': contains_keywords(apps_desc, VISION_KEYWORDS),
+        'uses_voice': contains_keywords(apps_desc, VOICE_KEYWORDS),
+        'has_memory': contains_keywords(apps, MEMORY_KEYWORDS),
+
+        # App category flags
+        'uses_spreadsheet': contains_keywords(apps, SPREADSHEET_APPS),
+        'uses_email': contains_keywords(apps, EMAIL_APPS),
+        'uses_storage': contains_keywords(apps, STORAGE_APPS),
+        'uses_communication': contains_keywords(apps, COMMUNICATION_APPS),
+        'uses_crm': contains_keywords(apps, CRM_APPS),
+        'uses_social_media': contains_keywords(apps, SOCIAL_MEDIA_APPS),
+        'uses_ecommerce': contains_keywords(apps, ECOMMERCE_APPS),
+        'uses_project_mgmt': contains_keywords(apps, PROJECT_MGMT_APPS),
+        'uses_forms': contains_keywords(apps, FORMS_APPS),
+    }
+    is_ai_powered = flags['is_ai_powered']
+
+    app_count = count_apps(df['apps_used'])
+    automation_type = determine_automation_types(combined, flags)
+    requires_coding = contains_keywords(apps, CODE_KEYWORDS)
+    complexity_level = determine_complexity_levels(
+        app_count, apps, desc, requires_coding, flags['is_webhook_based']
+    )
+    popularity_tier, engagement_score = determine_popularity_tiers(
+        df['total_views'], df['usage_count'], all_views, all_usage
+    )
+
+    enriched = {
+        'app_count': app_count,
+        'node_count': parse_node_counts(df['nodes_used'], app_count),
+        'automation_type': automation_type,
+        'automation_subtype': determine_automation_subtypes(combined, automation_type, flags),
+        'primary_industry': determine_primary_industries(combined, flags),
+        'use_case_tags': extract_use_case_tags(combined, flags),
+        'complexity_level': complexity_level,
+        'estimated_setup_time': estimate_setup_times(complexity_level, app_count),
+        'requires_coding': requires_coding,
+        **flags,
+
+        # Integration pattern and triggers
+        'integration_pattern': determine_integration_patterns(app_count, desc_name),
+        'primary_trigger_type': detect_trigger_types(desc_apps_name, apps, flags),
+        'primary_action_type': detect_action_types(desc_apps_name, flags),
+
+        # Popularity metrics
+        'popularity_tier': popularity_tier,
+        'engagement_score': engagement_score,
+        'trending_potential': determine_trending_potentials(is_ai_powered, popularity_tier),
+
+        # AI-specific fields
+        'ai_use_case': [
+            detect_ai_use_case(text) if is_ai else '' for text, is_ai in zip(desc_apps_name, is_ai_powered)
+        ],
+        'ai_provider': [detect_ai_provider(apps_) if is_ai else '' for apps_, is_ai in zip(apps, is_ai_powered)],
+        'has_rag': contains_keywords(apps, RAG_KEYWORDS) & is_ai_powered,
+
+        # Business value
+        'business_value_tags': [
+            extract_business_value_tags(atype, level) for atype, level in zip(automation_type, complexity_level)
+        ],
+        'target_company_size': determine_target_company_sizes(apps_desc, complexity_level, app_count),
+        'estimated_time_saved': estimate_times_saved(automation_type, complexity_level, app_count),
+        'keywords': [keyword_terms(words) for words in name.str.findall(WORD_REGEX.pattern)],
+    }
+
+    # All boolean flags as one bitmask
+    enriched['flags'] = pack_flags(enriched)
+
+    return df.assign(**enriched)
 
-    # Business value
-    value_tags = []
-    if automation_type in ['AI_AUTOMATION', 'MARKETING', 'PRODUCTIVITY']:
-        value_tags.append('time-savings')
-    if automation_type in ['MARKETING', 'SALES', 'ECOMMERCE']:
-        value_tags.append('revenue-generation')
-    if automation_type in ['DATA_SYNC', 'INTEGRATION']:
-        value_tags.append('process-optimization')
-    if complexity_level in ['BEGINNER', 'INTERMEDIATE']:
-        value_tags.append('easy-to-implement')
-    enriched['business_value_tags'] = json.dumps(value_tags) if value_tags else ''
 
-    enriched['target_company_size'] = determine_target_company_size(row, complexity_level)
-    enriched['estimated_time_saved'] = estimate_time_saved(automation_type, complexity_level, app_count)
+def enrich_in_parallel(df, all_views, all_usage, workers):
+    """Split the templates into one chunk per worker and enrich them in separate processes
 
-    # Keywords extraction (basic - extract key terms from name)
-    keywords = []
-    name_words = re.findall(r'\b\w+\b', name.lower())
-    stopwords = ['and', 'the', 'a', 'to', 'from', 'with', 'for', 'in', 'on', 'at', 'of']
-    keywords = [w for w in name_words if len(w) > 3 and w not in stopwords][:10]
-    enriched['keywords'] = json.dumps(keywords) if keywords else ''
+    Percentiles stay global: every chunk is ranked against the full sorted
+    view and usage arrays.
+    """
+    if workers <= 1 or len(df) < workers:
+        return enrich_dataframe(df, all_views, all_usage)
 
-    return enriched
+    bounds = np.linspace(0, len(df), workers + 1).astype(int)
+    chunks = [df.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            enrich_dataframe, chunks, [all_views] * workers, [all_usage] * workers
+        )
+        return pd.concat(list(results))
 
 
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
 
-def main():
+def find_latest_unified_csv(directory):
+    """Most recently modified unified CSV in directory, skipping enriched outputs"""
+    try:
+        with os.scandir(directory) as entries:
+            latest = max(
+                (entry for entry in entries
+                 if entry.name.startswith('unified_templates_') and entry.name.endswith('.csv')
+                 and not entry.name.startswith('unified_templates_enriched_')),
+                key=lambda entry: entry.stat().st_mtime,
+                default=None
+            )
+    except FileNotFoundError:
+        return None
+    return latest.path if latest else None
+
+
+def load_unified_csv(filepath):
+    """Load the unified CSV with every field as text, empty fields as ''"""
+    with open(filepath, newline='', encoding='utf-8') as f:
+        header = next(csv.reader(f))
+
+    # pyarrow's multi-threaded parser; descriptions may span several lines
+    table = pacsv.read_csv(
+        filepath,
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            column_types={col: pa.string() for col in header},
+            strings_can_be_null=False,
+            quoted_strings_can_be_null=False
+        )
+    )
+    # Release each Arrow column as soon as it is converted, so the file is
+    # never held twice in memory
+    return table.to_pandas(split_blocks=True, self_destruct=True).fillna('')
+
+
+def encode_tags(tags):
+    """JSON-encode a tag list for the CSV, empty lists as ''"""
+    if not tags:
+        return ''
+    # Tags are ASCII slugs and words, so they can be joined straight into
+    # json.dumps' format; anything JSON would escape goes through json.dumps
+    plain = ''.join(tags)
+    if plain.isascii() and plain.isprintable() and '"' not in plain and '\\' not in plain:
+        return '["' + '", "'.join(tags) + '"]'
+    return json.dumps(tags)
+
+
+def write_csv(df, filepath):
+    """Write the enriched templates as CSV with pyarrow's writer"""
+    df = df.assign(**{col: [encode_tags(tags) for tags in df[col]] for col in TAG_COLUMNS})
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), filepath)
+
+
+def write_parquet(df, filepath):
+    """Write the enriched templates as typed Parquet
+
+    View and usage counts become numbers, labels categoricals and tags
+    list<string> columns.
+    """
+    df = df.assign(**{
+        col: pd.to_numeric(df[col], errors='coerce') for col in ('total_views', 'usage_count')
+    }).astype(OUTPUT_CATEGORIES)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for col in TAG_COLUMNS:
+        # Typed explicitly so a column of only empty lists isn't list<null>
+        index = table.schema.get_field_index(col)
+        table = table.set_column(index, col, pa.array(df[col], type=pa.list_(pa.string())))
+    pq.write_table(table, filepath, compression='zstd')
+
+
+# Enriched results of earlier runs, keyed by input contents and enrichment code
+CACHE_DIR = './cache'
+
+
+def enrichment_cache_path(input_file):
+    """Cache file for an input CSV, keyed by its bytes and this script's source"""
+    with open(input_file, 'rb') as f:
+        digest = hashlib.file_digest(f, 'blake2b')
+    # Changing the enrichment logic must not serve stale results
+    with open(__file__, 'rb') as f:
+        digest.update(f.read())
+    return os.path.join(CACHE_DIR, f'{digest.hexdigest()[:16]}.parquet')
+
+
+def write_enrichment_cache(df, cache_file):
+    """Store the enriched DataFrame as-is, tag lists as list columns"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), cache_file)
+
+
+def read_enrichment_cache(cache_file):
+    """Load a cached enriched DataFrame with the dtypes enrich_dataframe returns"""
+    df = pq.read_table(cache_file).to_pandas()
+    # Parquet lists come back as arrays
+    return df.assign(**{col: [list(tags) for tags in df[col]] for col in TAG_COLUMNS})
+
+
+def main(workers=1, output_format='both', use_cache=True):
     logging.info("=" * 80)
     logging.info("  ENRICHING UNIFIED CSV WITH CATEGORIZATION COLUMNS")
     logging.info("=" * 80)
@@ -710,111 +877,93 @@ def main():
     logging.info(f"📥 Loading unified CSV: {input_file}")
 
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
+        df = load_unified_csv(input_file)
     except FileNotFoundError:
         # Try to find the latest unified file
-        import glob
-        unified_files = glob.glob('./exports/unified_templates_*.csv')
-        if unified_files:
-            input_file = max(unified_files)  # Get most recent
+        input_file = find_latest_unified_csv('./exports')
+        if input_file:
             logging.info(f"Using latest unified file: {input_file}")
-            with open(input_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
+            df = load_unified_csv(input_file)
         else:
             logging.error("❌ No unified CSV file found!")
             return 1
 
-    logging.info(f"✅ Loaded {len(rows):,} templates")
+    logging.info(f"✅ Loaded {len(df):,} templates")
     logging.info("")
 
-    # Collect all views and usage for percentile calculation
-    logging.info("📊 Calculating popularity metrics...")
-    all_views = []
-    all_usage = []
-    for row in rows:
-        try:
-            if row.get('total_views'):
-                all_views.append(int(row['total_views']))
-        except:
-            pass
-        try:
-            if row.get('usage_count'):
-                all_usage.append(int(row['usage_count']))
-        except:
-            pass
-
-    logging.info(f"   • {len(all_views):,} templates have view counts")
-    logging.info(f"   • {len(all_usage):,} templates have usage counts")
-    logging.info("")
-
-    # Enrich each template
-    logging.info("🔄 Enriching templates...")
-    enriched_rows = []
-
-    for i, row in enumerate(rows, 1):
-        if i % 1000 == 0:
-            logging.info(f"   Processed {i:,}/{len(rows):,} templates ({i/len(rows)*100:.1f}%)")
+    cache_file = enrichment_cache_path(input_file) if use_cache else None
+    if cache_file and os.path.exists(cache_file):
+        logging.info(f"♻️  Input unchanged since last run, using cached enrichment: {cache_file}")
+        enriched_df = read_enrichment_cache(cache_file)
+    else:
+        # Collect all views and usage for percentile calculation
+        logging.info("📊 Calculating popularity metrics...")
+        # Sorted once so every percentile is a binary search
+        views = parse_ints(df['total_views'])
+        usage = parse_ints(df['usage_count'])
+        all_views = np.sort(views[~np.isnan(views)])
+        all_usage = np.sort(usage[~np.isnan(usage)])
+
+        logging.info(f"   • {len(all_views):,} templates have view counts")
+        logging.info(f"   • {len(all_usage):,} templates have usage counts")
+        logging.info("")
 
-        try:
-            enriched = enrich_template(row, all_views, all_usage)
-            enriched_rows.append(enriched)
-        except Exception as e:
-            logging.error(f"   Error enriching template {row.get('platform_id', 'unknown')}: {e}")
-            enriched_rows.append(row)  # Keep original if enrichment fails
+        # Enrich all templates
+        logging.info("🔄 Enriching templates...")
+        enriched_df = enrich_in_parallel(df, all_views, all_usage, workers)
+        if cache_file:
+            write_enrichment_cache(enriched_df, cache_file)
 
-    logging.info(f"✅ Enriched {len(enriched_rows):,} templates")
+    logging.info(f"✅ Enriched {len(enriched_df):,} templates")
     logging.info("")
 
-    # Write enriched CSV
+    # Write enriched CSV and/or Parquet
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = f'./exports/unified_templates_enriched_{timestamp}.csv'
-
-    logging.info(f"💾 Writing enriched CSV: {output_file}")
-
-    # Get all fieldnames (original + new)
-    if enriched_rows:
-        fieldnames = list(enriched_rows[0].keys())
-
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(enriched_rows)
-
-        import os
-        file_size = os.path.getsize(output_file)
-        file_size_mb = file_size / (1024 * 1024)
-
-        logging.info(f"✅ Enriched CSV created successfully!")
-        logging.info(f"   File: {output_file}")
-        logging.info(f"   Size: {file_size_mb:.2f} MB")
-        logging.info(f"   Templates: {len(enriched_rows):,}")
+    output_base = f'./exports/unified_templates_enriched_{timestamp}'
+    writers = {'csv': write_csv, 'parquet': write_parquet}
+    formats = list(writers) if output_format == 'both' else [output_format]
+
+    logging.info(f"💾 Writing enriched {' and '.join(fmt.upper() for fmt in formats)}: {output_base}")
+
+    if len(enriched_df) > 0:
+        fieldnames = list(enriched_df.columns)
+        output_files = []
+        for fmt in formats:
+            output_file = f'{output_base}.{fmt}'
+            writers[fmt](enriched_df, output_file)
+            output_files.append(output_file)
+
+        logging.info(f"✅ Enriched output created successfully!")
+        for output_file in output_files:
+            file_size_mb = os.path.getsize(output_file) / (1024 * 1024)
+            logging.info(f"   File: {output_file}")
+            logging.info(f"   Size: {file_size_mb:.2f} MB")
+        logging.info(f"   Templates: {len(enriched_df):,}")
         logging.info(f"   Columns: {len(fieldnames)} (30 original + {len(fieldnames) - 30} new)")
         logging.info("")
 
         # Generate statistics
         logging.info("📊 Enrichment Statistics:")
+        percent_per_template = 100.0 / len(enriched_df)
 
         # Count by automation type
-        automation_types = Counter(row['automation_type'] for row in enriched_rows if row.get('automation_type'))
+        # Most common first, ties in order of first appearance
+        automation_types = enriched_df['automation_type'].value_counts(sort=False)
+        automation_types = automation_types.sort_values(ascending=False, kind='stable')
         logging.info(f"   Automation Types:")
-        for atype, count in automation_types.most_common(10):
-            pct = (count / len(enriched_rows)) * 100
-            logging.info(f"      • {atype}: {count:,} ({pct:.1f}%)")
+        for atype, count in automation_types.head(10).items():
+            logging.info(f"      • {atype}: {count:,} ({count * percent_per_template:.1f}%)")
 
         # AI stats
-        ai_count = sum(1 for row in enriched_rows if row.get('is_ai_powered') == True)
-        logging.info(f"   AI-Powered: {ai_count:,} ({ai_count/len(enriched_rows)*100:.1f}%)")
+        ai_count = enriched_df['is_ai_powered'].sum()
+        logging.info(f"   AI-Powered: {ai_count:,} ({ai_count * percent_per_template:.1f}%)")
 
         # Complexity stats
-        complexity_counts = Counter(row['complexity_level'] for row in enriched_rows if row.get('complexity_level'))
+        complexity_counts = enriched_df['complexity_level'].value_counts()
         logging.info(f"   Complexity Levels:")
         for level in ['BEGINNER', 'INTERMEDIATE', 'ADVANCED', 'EXPERT']:
             count = complexity_counts.get(level, 0)
-            pct = (count / len(enriched_rows)) * 100
-            logging.info(f"      • {level}: {count:,} ({pct:.1f}%)")
+            logging.info(f"      • {level}: {count:,} ({count * percent_per_template:.1f}%)")
 
         logging.info("")
         logging.info("=" * 80)
@@ -829,5 +978,12 @@ def main():
 
 
 if __name__ == "__main__":
-    import sys
-    sys.exit(main())
+    parser = argparse.ArgumentParser(description="Add categorization columns to the unified CSV")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes to enrich templates with (default: 1)")
+    parser.add_argument('--format', choices=['csv', 'parquet', 'both'], default='both',
+                        help="output format; Parquet keeps dtypes and stores tags as lists (default: both)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="re-enrich even if this input was enriched before")
+    args = parser.parse_args()
+    sys.exit(main(workers=args.workers, output_format=args.format, use_cache=not args.no_cache))
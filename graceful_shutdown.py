@@ -0,0 +1,33 @@
+"""
+Graceful shutdown shared by the production scrapers
+- SIGINT/SIGTERM set a stop flag instead of killing the process
+- The scrape loop polls it between templates and saves what it has
+"""
+import logging
+import signal
+import threading
+
+
+class GracefulKiller:
+    """Handle keyboard interrupts gracefully"""
+    __slots__ = ('_stop', 'message', 'should_stop')
+
+    def __init__(self, message="Finishing current template and saving progress..."):
+        self._stop = threading.Event()
+        self.message = message
+        # Bound once so the per-template check is a single C call
+        self.should_stop = self._stop.is_set
+
+        signal.signal(signal.SIGINT, self.exit_gracefully)
+        signal.signal(signal.SIGTERM, self.exit_gracefully)
+
+    def exit_gracefully(self, *args):
+        logging.warning(f"\n\n⚠️  Interrupt received. {self.message}")
+        self.stop()
+
+    def stop(self):
+        self._stop.set()
+
+    def wait(self, seconds):
+        """Sleep for up to seconds, waking early on interrupt; True if interrupted"""
+        return self._stop.wait(seconds)
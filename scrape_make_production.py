@@ -11,35 +11,27 @@ Production-ready Make.com template scraper using API
 import logging
 import time
 import sys
-import signal
+import traceback
 from datetime import datetime
 from template_harvester.config import load_config
 from template_harvester.utils.logging_setup import setup_logging
 from template_harvester.scrapers.make_scraper import MakeScraper
 from template_harvester.normalizers.make_normalizer import MakeNormalizer
 from template_harvester.exporters.csv_exporter import CSVExporter
-
-
-class GracefulKiller:
-    """Handle keyboard interrupts gracefully"""
-    kill_now = False
-
-    def __init__(self):
-        signal.signal(signal.SIGINT, self.exit_gracefully)
-        signal.signal(signal.SIGTERM, self.exit_gracefully)
-
-    def exit_gracefully(self, *args):
-        logging.warning("\n\n⚠️  Interrupt received. Finishing current batch and saving progress...")
-        self.kill_now = True
+from graceful_shutdown import GracefulKiller
 
 
 def main():
     # Initialize graceful shutdown handler
-    killer = GracefulKiller()
+    killer = GracefulKiller("Finishing current batch and saving progress...")
 
     # Load config
     config = load_config()
     setup_logging(config)
+    # Skip the thread and process lookups logging does for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
 
     # Print banner
     logging.info("=" * 80)
@@ -50,11 +42,11 @@ def main():
 
     scraper_config = config['platforms']['make']
     logging.info(f"  • Base URL: {scraper_config.get('base_url')}")
-    logging.info(f"  • API endpoint: /api/v2/templates/public")
+    logging.info("  • API endpoint: /api/v2/templates/public")
     logging.info(f"  • Batch size: {scraper_config.get('limit', 100)} templates per request")
     logging.info(f"  • Max pages: {scraper_config.get('max_pages', 10)}")
-    logging.info(f"  • Incremental CSV writing: Enabled")
-    logging.info(f"  • Keyboard interrupt: Graceful shutdown enabled")
+    logging.info("  • Incremental CSV writing: Enabled")
+    logging.info("  • Keyboard interrupt: Graceful shutdown enabled")
     logging.info("")
 
     # Initialize components
@@ -67,7 +59,7 @@ def main():
         'total': 0,
         'success': 0,
         'failed': 0,
-        'start_time': time.time()
+        'start_ns': time.monotonic_ns()
     }
 
     try:
@@ -100,66 +92,66 @@ def main():
             logging.info("=" * 80)
             logging.info("")
 
-            # Process and write each template
+            total = stats['total']
+            percent_per_template = 100.0 / total
+            # Checked once; the level doesn't change during a run
+            verbose = logging.getLogger().isEnabledFor(logging.DEBUG)
+
             for i, template_data in enumerate(templates, 1):
                 # Check for interrupt
-                if killer.kill_now:
+                if killer.should_stop():
                     logging.warning("⚠️  Gracefully stopping scraper...")
                     break
 
                 try:
-                    template_id = template_data.get('id')
-                    name = template_data.get('name', 'Unknown')
-
-                    logging.info(f"[{i}/{stats['total']}] ID: {template_id}")
-                    logging.info(f"  📝 {name[:60]}")
-
-                    # Show extracted info
-                    apps = template_data.get('usedApps', [])
-                    usage = template_data.get('usage', 0)
-                    logging.info(f"  🔗 Apps: {', '.join(apps[:5])}{' ...' if len(apps) > 5 else ''}")
-                    logging.info(f"  📊 Usage: {usage:,}")
-
-                    # Normalize
+                    # Per-template details only at DEBUG; INFO keeps the progress blocks
+                    if verbose:
+                        apps = template_data.get('usedApps', [])
+                        logging.debug("[%d/%d] ID: %s", i, total, template_data.get('id'))
+                        logging.debug("  📝 %.60s", template_data.get('name', 'Unknown'))
+                        logging.debug("  🔗 Apps: %s%s", ', '.join(apps[:5]), ' ...' if len(apps) > 5 else '')
+                        logging.debug("  📊 Usage: %s", template_data.get('usage', 0))
+
+                    # Normalize template
                     normalized_templates = normalizer.normalize([template_data])
 
                     if not normalized_templates:
                         stats['failed'] += 1
-                        logging.error(f"  ✗ Normalization failed")
+                        logging.error("  ✗ Normalization failed")
                         continue
 
                     # Write to CSV immediately
                     normalized = normalized_templates[0]
                     if exporter.write_row(normalized):
                         stats['success'] += 1
-                        logging.info(f"  ✅ Written to CSV")
+                        logging.debug("  ✅ Written to CSV")
                     else:
                         stats['failed'] += 1
-                        logging.error(f"  ✗ CSV write failed")
+                        logging.error("  ✗ CSV write failed")
 
                     # Progress update every 50 templates
                     if i % 50 == 0:
-                        elapsed = time.time() - stats['start_time']
-                        avg_time = elapsed / i
-                        remaining = (stats['total'] - i) * avg_time
+                        # Monotonic, so clock adjustments can't skew the ETA
+                        elapsed_ns = time.monotonic_ns() - stats['start_ns']
+                        avg_time = elapsed_ns // i / 1e9
+                        remaining = (total - i) * avg_time
                         success_rate = (stats['success'] / i * 100) if i > 0 else 0
 
                         logging.info("")
-                        logging.info(f"{'─' * 80}")
-                        logging.info(f"  📊 PROGRESS: {i}/{stats['total']} ({i / stats['total'] * 100:.1f}%)")
-                        logging.info(f"  ✅ Success: {stats['success']} | ❌ Failed: {stats['failed']} | Rate: {success_rate:.1f}%")
-                        logging.info(f"  ⏱️  Avg: {avg_time:.2f}s/template | Remaining: {remaining:.1f}s")
-                        logging.info(f"{'─' * 80}")
+                        logging.info('─' * 80)
+                        logging.info("  📊 PROGRESS: %d/%d (%.1f%%)", i, total, i * percent_per_template)
+                        logging.info("  ✅ Success: %d | ❌ Failed: %d | Rate: %.1f%%", stats['success'], stats['failed'], success_rate)
+                        logging.info("  ⏱️  Avg: %.2fs/template | Remaining: %.1fs", avg_time, remaining)
+                        logging.info('─' * 80)
                         logging.info("")
 
                 except Exception as e:
                     stats['failed'] += 1
-                    logging.error(f"  ✗ Error processing template: {e}")
+                    logging.error("  ✗ Error processing template %s: %s", template_data.get('id'), e)
                     continue
 
         except Exception as e:
-            logging.error(f"❌ Error fetching templates from API: {e}")
-            import traceback
+            logging.error("❌ Error fetching templates from API: %s", e)
             traceback.print_exc()
             return 1
 
@@ -167,24 +159,24 @@ def main():
         final_path = exporter.close()
 
         # Final statistics
-        elapsed_total = time.time() - stats['start_time']
+        elapsed_total = (time.monotonic_ns() - stats['start_ns']) / 1e9
 
         logging.info("")
         logging.info("=" * 80)
         logging.info("  SCRAPING COMPLETE")
         logging.info("=" * 80)
         logging.info("")
-        logging.info(f"📊 Final Statistics:")
+        logging.info("📊 Final Statistics:")
         logging.info(f"  • Total templates: {stats['total']}")
         logging.info(f"  • Successfully processed: {stats['success']}")
         logging.info(f"  • Failed: {stats['failed']}")
         logging.info(f"  • Success rate: {(stats['success'] / stats['total'] * 100):.1f}%" if stats['total'] > 0 else "  • Success rate: N/A")
         logging.info("")
-        logging.info(f"⏱️  Time:")
+        logging.info("⏱️  Time:")
         logging.info(f"  • Total: {elapsed_total:.2f} seconds ({elapsed_total / 60:.2f} minutes)")
         logging.info(f"  • Average: {elapsed_total / stats['total']:.2f}s per template" if stats['total'] > 0 else "  • Average: N/A")
         logging.info("")
-        logging.info(f"📄 Output:")
+        logging.info("📄 Output:")
         logging.info(f"  • CSV file: {final_path}")
         logging.info(f"  • Log file: {config['logging']['file']}")
         logging.info("")
@@ -194,8 +186,7 @@ def main():
         return 0
 
     except Exception as e:
-        logging.error(f"❌ Fatal error: {e}")
-        import traceback
+        logging.error("❌ Fatal error: %s", e)
         traceback.print_exc()
 
         # Try to close CSV gracefully
@@ -8,82 +8,86 @@ Production-ready Zapier template scraper with comprehensive guardrails
 - Keyboard interrupt handling
 - Memory-efficient incremental CSV writing
 """
+import gc
 import logging
+import os
+import random
 import time
 import sys
-import signal
+import traceback
 from datetime import datetime
 from template_harvester.config import load_config
 from template_harvester.utils.logging_setup import setup_logging
 from template_harvester.scrapers.zapier_scraper_v2 import ZapierScraperV2
 from template_harvester.normalizers.zapier_normalizer_v2 import ZapierNormalizerV2
 from template_harvester.exporters.csv_exporter import CSVExporter
+from graceful_shutdown import GracefulKiller
 
 
-class GracefulKiller:
-    """Handle keyboard interrupts gracefully"""
-    kill_now = False
-
-    def __init__(self):
-        signal.signal(signal.SIGINT, self.exit_gracefully)
-        signal.signal(signal.SIGTERM, self.exit_gracefully)
-
-    def exit_gracefully(self, *args):
-        logging.warning("\n\n⚠️  Interrupt received. Finishing current template and saving progress...")
-        self.kill_now = True
+# Any one of these identifies a scraped template
+TEMPLATE_ID_FIELDS = ('slug', 'template_id', 'h1_title', 'meta_title')
 
 
 def validate_template_data(template_data):
     """Validate that template data has minimum required fields"""
-    if not template_data:
-        return False
-
     # Must have at least a URL and some identifiable info
-    has_url = bool(template_data.get('url'))
-    has_identifier = bool(
-        template_data.get('slug') or
-        template_data.get('template_id') or
-        template_data.get('h1_title') or
-        template_data.get('meta_title')
-    )
+    return bool(template_data and template_data.get('url')
+                and any(template_data.get(field) for field in TEMPLATE_ID_FIELDS))
+
+
+def load_scraped_urls(progress_file):
+    """URLs a previous run recorded as written to CSV, or an empty set"""
+    if not progress_file or not os.path.exists(progress_file):
+        return set()
+    with open(progress_file, encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.strip()}
+
 
-    return has_url and has_identifier
+def backoff_delay(attempt, retry_delay, jitter, max_delay):
+    """Exponential backoff before retrying after the given attempt, with random jitter
+
+    Jitter spreads retries out so failures that happened together (e.g. one
+    outage) don't all retry at the same moment.
+    """
+    wait_time = retry_delay * (2 ** (attempt - 1)) * random.uniform(1 - jitter, 1 + jitter)
+    return min(wait_time, max_delay)
 
 
-def scrape_template_with_retry(scraper, url, config, attempt=1):
+def scrape_template_with_retry(scraper, url, max_retries, retry_delay, jitter, max_delay):
     """
     Scrape a template with retry logic and exponential backoff
     """
-    max_retries = config.get('max_retries', 3)
-    retry_delay = config.get('retry_delay', 5)
+    attempt = 1
 
-    try:
-        template_data = scraper._extract_template_data(url)
+    while True:
+        try:
+            template_data = scraper._extract_template_data(url)
+            # Nothing downstream reads the raw HTML; drop it before validating
+            # or sleeping on a retry
+            if template_data:
+                template_data.pop('page_source', None)
+
+            if validate_template_data(template_data):
+                return template_data, None
 
-        if validate_template_data(template_data):
-            return template_data, None
-        else:
             error_msg = "Invalid or incomplete data extracted"
+            if attempt >= max_retries:
+                return None, error_msg
 
-            if attempt < max_retries:
-                wait_time = retry_delay * (2 ** (attempt - 1))  # Exponential backoff
-                logging.warning(f"  ⚠️  {error_msg}. Retrying in {wait_time}s... (attempt {attempt + 1}/{max_retries})")
-                time.sleep(wait_time)
-                return scrape_template_with_retry(scraper, url, config, attempt + 1)
-            else:
+            wait_time = backoff_delay(attempt, retry_delay, jitter, max_delay)
+            logging.warning("  ⚠️  %s. Retrying in %.1fs... (attempt %d/%d)", error_msg, wait_time, attempt + 1, max_retries)
+
+        except Exception as e:
+            error_msg = str(e)
+            if attempt >= max_retries:
+                logging.error("  ✗ Failed after %d attempts: %s", max_retries, error_msg)
                 return None, error_msg
 
-    except Exception as e:
-        error_msg = str(e)
+            wait_time = backoff_delay(attempt, retry_delay, jitter, max_delay)
+            logging.warning("  ⚠️  Error: %s. Retrying in %.1fs... (attempt %d/%d)", error_msg, wait_time, attempt + 1, max_retries)
 
-        if attempt < max_retries:
-            wait_time = retry_delay * (2 ** (attempt - 1))
-            logging.warning(f"  ⚠️  Error: {error_msg}. Retrying in {wait_time}s... (attempt {attempt + 1}/{max_retries})")
-            time.sleep(wait_time)
-            return scrape_template_with_retry(scraper, url, config, attempt + 1)
-        else:
-            logging.error(f"  ✗ Failed after {max_retries} attempts: {error_msg}")
-            return None, error_msg
+        time.sleep(wait_time)
+        attempt += 1
 
 
 def main():
@@ -93,6 +97,10 @@ def main():
     # Load config
     config = load_config()
     setup_logging(config)
+    # Skip the thread and process lookups logging does for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
 
     # Print banner
     logging.info("="*80)
@@ -102,13 +110,25 @@ def main():
     logging.info("Guardrails enabled:")
 
     scraper_config = config['platforms']['zapier']
-    logging.info(f"  • Rate limit: {scraper_config.get('rate_limit_delay', 3)}s between requests")
-    logging.info(f"  • Max retries: {scraper_config.get('max_retries', 3)} per template")
-    logging.info(f"  • Retry delay: {scraper_config.get('retry_delay', 5)}s with exponential backoff")
-    logging.info(f"  • Batch delay: {scraper_config.get('batch_delay', 10)}s every {scraper_config.get('batch_size', 50)} templates")
+    # Read every setting once; the scrape loop and retries use these locals
+    rate_limit = scraper_config.get('rate_limit_delay', 3)
+    max_retries = scraper_config.get('max_retries', 3)
+    retry_delay = scraper_config.get('retry_delay', 5)
+    # A fraction of the delay; above 1 the jittered delay could go negative and crash time.sleep
+    jitter = min(max(scraper_config.get('jitter', 0.5), 0.0), 1.0)
+    max_delay = scraper_config.get('max_delay', 30)
+    batch_size = scraper_config.get('batch_size', 50)
+    batch_delay = scraper_config.get('batch_delay', 10)
+    progress_file = scraper_config.get('progress_file')
+
+    logging.info(f"  • Rate limit: {rate_limit}s between requests")
+    logging.info(f"  • Max retries: {max_retries} per template")
+    logging.info(f"  • Retry delay: {retry_delay}s with jittered exponential backoff (max {max_delay}s)")
+    logging.info(f"  • Batch delay: {batch_delay}s every {batch_size} templates")
     logging.info(f"  • Page timeout: {scraper_config.get('page_load_timeout', 30)}s")
-    logging.info(f"  • Incremental CSV writing: Enabled")
-    logging.info(f"  • Keyboard interrupt: Graceful shutdown enabled")
+    logging.info("  • Incremental CSV writing: Enabled")
+    logging.info("  • Keyboard interrupt: Graceful shutdown enabled")
+    logging.info("  • Resume: %s", progress_file or 'Disabled')
     logging.info("")
 
     # Initialize components
@@ -122,8 +142,9 @@ def main():
         'success': 0,
         'failed': 0,
         'skipped': 0,
-        'start_time': time.time()
+        'start_ns': time.monotonic_ns()
     }
+    progress = None
 
     try:
         # Initialize WebDriver
@@ -150,6 +171,15 @@ def main():
         logging.info(f"✅ Found {stats['total']} templates to scrape")
         logging.info("")
 
+        # Skip templates an earlier run already wrote
+        scraped_urls = load_scraped_urls(progress_file)
+        if scraped_urls:
+            template_urls = [url for url in template_urls if url not in scraped_urls]
+            stats['skipped'] = stats['total'] - len(template_urls)
+            stats['total'] = len(template_urls)
+            logging.info("⏭️  Skipping %d templates already scraped (%s)", stats['skipped'], progress_file)
+            logging.info("")
+
         # Limit templates if configured (for testing)
         max_templates = scraper_config.get('max_templates')
         if max_templates:
@@ -168,38 +198,54 @@ def main():
         logging.info("="*80)
         logging.info("")
 
+        # Driver, config and URL list live for the whole run; keep them out
+        # of the collector's full sweeps
+        gc.freeze()
+
+        # Record each written URL as it happens, so an interrupted run can resume
+        if progress_file:
+            progress = open(progress_file, 'a', buffering=1, encoding='utf-8')
+
+        # The progress block only computes its figures if INFO will be shown
+        show_progress = logging.getLogger().isEnabledFor(logging.INFO)
+
         # Scrape each template
-        batch_size = scraper_config.get('batch_size', 50)
-        batch_delay = scraper_config.get('batch_delay', 10)
-        rate_limit = scraper_config.get('rate_limit_delay', 3)
+        rate_limit_ns = int(rate_limit * 1e9)
+        next_request_ns = time.monotonic_ns()
 
         for i, url in enumerate(template_urls, 1):
             # Check for interrupt
-            if killer.kill_now:
+            if killer.should_stop():
                 logging.warning("⚠️  Gracefully stopping scraper...")
                 break
 
             try:
                 slug = url.split('/')[-1]
-                logging.info(f"[{i}/{stats['total']}] {slug}")
+                logging.info("[%d/%d] %s", i, stats['total'], slug)
+
+                # Start requests rate_limit apart; time spent scraping and
+                # normalizing the previous template counts toward the wait
+                wait_ns = next_request_ns - time.monotonic_ns()
+                if wait_ns > 0 and killer.wait(wait_ns / 1e9):
+                    logging.warning("⚠️  Gracefully stopping scraper...")
+                    break
+                next_request_ns = time.monotonic_ns() + rate_limit_ns
 
                 # Scrape with retry logic
-                template_data, error = scrape_template_with_retry(scraper, url, scraper_config)
+                template_data, error = scrape_template_with_retry(
+                    scraper, url, max_retries, retry_delay, jitter, max_delay
+                )
 
                 if not template_data:
                     stats['failed'] += 1
-                    logging.error(f"  ✗ Failed: {error or 'Unknown error'}")
+                    logging.error("  ✗ Failed: %s", error or 'Unknown error')
                     continue
 
-                # Clean up large data to save memory
-                if 'page_source' in template_data:
-                    del template_data['page_source']
-
                 # Show extracted info
                 name = template_data.get('h1_title') or template_data.get('meta_title') or 'Unknown'
                 apps_count = len(template_data.get('page_apps', []))
-                logging.info(f"  📝 {name[:60]}")
-                logging.info(f"  🔗 Apps: {apps_count}")
+                logging.info("  📝 %.60s", name)
+                logging.info("  🔗 Apps: %d", apps_count)
 
                 # Normalize
                 try:
@@ -207,78 +253,83 @@ def main():
 
                     if not normalized_templates:
                         stats['failed'] += 1
-                        logging.error(f"  ✗ Normalization failed")
+                        logging.error("  ✗ Normalization failed")
                         continue
 
                     # Write to CSV immediately
                     normalized = normalized_templates[0]
                     if exporter.write_row(normalized):
                         stats['success'] += 1
-                        logging.info(f"  ✅ Written to CSV")
+                        if progress:
+                            progress.write(url + '\n')
+                        logging.info("  ✅ Written to CSV")
                     else:
                         stats['failed'] += 1
-                        logging.error(f"  ✗ CSV write failed")
+                        logging.error("  ✗ CSV write failed")
 
                 except Exception as e:
                     stats['failed'] += 1
-                    logging.error(f"  ✗ Normalization error: {e}")
+                    logging.error("  ✗ Normalization error: %s", e)
                     continue
 
                 # Progress update every 10 templates
-                if i % 10 == 0:
-                    elapsed = time.time() - stats['start_time']
-                    avg_time = elapsed / i
+                if i % 10 == 0 and show_progress:
+                    # Monotonic, so clock adjustments can't skew the ETA
+                    elapsed_ns = time.monotonic_ns() - stats['start_ns']
+                    avg_time = elapsed_ns // i / 1e9
                     remaining = (stats['total'] - i) * avg_time
                     success_rate = (stats['success'] / i * 100) if i > 0 else 0
 
                     logging.info("")
-                    logging.info(f"{'─'*80}")
-                    logging.info(f"  📊 PROGRESS: {i}/{stats['total']} ({i/stats['total']*100:.1f}%)")
-                    logging.info(f"  ✅ Success: {stats['success']} | ❌ Failed: {stats['failed']} | Rate: {success_rate:.1f}%")
-                    logging.info(f"  ⏱️  Avg: {avg_time:.1f}s/template | Remaining: {remaining/60:.1f} min")
-                    logging.info(f"{'─'*80}")
+                    logging.info('─' * 80)
+                    logging.info("  📊 PROGRESS: %d/%d (%.1f%%)", i, stats['total'], i / stats['total'] * 100)
+                    logging.info("  ✅ Success: %d | ❌ Failed: %d | Rate: %.1f%%", stats['success'], stats['failed'], success_rate)
+                    logging.info("  ⏱️  Avg: %.1fs/template | Remaining: %.1f min", avg_time, remaining / 60)
+                    logging.info('─' * 80)
                     logging.info("")
 
                 # Batch delay - longer pause every N templates to be extra respectful
                 if i % batch_size == 0 and i < stats['total']:
-                    logging.info(f"⏸️  Batch pause ({batch_delay}s) to respect rate limits...")
-                    time.sleep(batch_delay)
-                else:
-                    # Regular rate limiting
-                    time.sleep(rate_limit)
+                    logging.info("⏸️  Batch pause (%ss) to respect rate limits...", batch_delay)
+                    # Reclaim the batch's garbage while we're waiting anyway
+                    gc.collect()
+                    # Interrupts end the pause early; the loop stops at the next check
+                    killer.wait(batch_delay)
 
             except KeyboardInterrupt:
                 logging.warning("\n⚠️  Keyboard interrupt detected...")
-                killer.kill_now = True
+                killer.stop()
                 break
 
             except Exception as e:
                 stats['failed'] += 1
-                logging.error(f"  ✗ Unexpected error: {e}")
+                logging.error("  ✗ Unexpected error: %s", e)
                 continue
 
         # Close CSV file
         final_path = exporter.close()
 
         # Final statistics
-        elapsed_total = time.time() - stats['start_time']
+        elapsed_total = (time.monotonic_ns() - stats['start_ns']) / 1e9
 
         logging.info("")
         logging.info("="*80)
         logging.info("  SCRAPING COMPLETE")
         logging.info("="*80)
         logging.info("")
-        logging.info(f"📊 Final Statistics:")
+        logging.info("📊 Final Statistics:")
         logging.info(f"  • Total templates found: {stats['total']}")
         logging.info(f"  • Successfully scraped: {stats['success']}")
         logging.info(f"  • Failed: {stats['failed']}")
+        if stats['skipped']:
+            logging.info("  • Skipped (already scraped): %d", stats['skipped'])
         logging.info(f"  • Success rate: {(stats['success']/stats['total']*100):.1f}%" if stats['total'] > 0 else "  • Success rate: N/A")
         logging.info("")
-        logging.info(f"⏱️  Time:")
+        logging.info("⏱️  Time:")
         logging.info(f"  • Total: {elapsed_total/60:.1f} minutes ({elapsed_total/3600:.2f} hours)")
         logging.info(f"  • Average: {elapsed_total/stats['total']:.1f}s per template" if stats['total'] > 0 else "  • Average: N/A")
         logging.info("")
-        logging.info(f"📄 Output:")
+        logging.info("📄 Output:")
         logging.info(f"  • CSV file: {final_path}")
         logging.info(f"  • Log file: {config['logging']['file']}")
         logging.info("")
@@ -288,8 +339,7 @@ def main():
         return 0
 
     except Exception as e:
-        logging.error(f"❌ Fatal error: {e}")
-        import traceback
+        logging.error("❌ Fatal error: %s", e)
         traceback.print_exc()
 
         # Try to close CSV gracefully
@@ -301,6 +351,9 @@ def main():
         return 1
 
     finally:
+        if progress:
+            progress.close()
+
         # Always close WebDriver
         try:
             scraper._close_driver()
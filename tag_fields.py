@@ -0,0 +1,39 @@
+"""
+Tag columns shared by the dashboard and its tests
+- JSON text in CSV exports, list<string> in Parquet exports
+- No Streamlit imports, so it can be used without running the app
+"""
+import json
+
+import numpy as np
+import orjson
+import pyarrow as pa
+
+# Tag columns: JSON text in CSV exports, list<string> in Parquet exports
+TAG_COLUMNS = ['use_case_tags', 'business_value_tags', 'keywords']
+
+
+def parse_json_field(value):
+    """Parse JSON field safely"""
+    # Parquet exports already store tags as lists
+    if isinstance(value, (list, np.ndarray)):
+        return list(value)
+    # value != value catches NaN without a pd.isna call per field
+    if value is None or value != value or value == '':
+        return []
+    try:
+        return orjson.loads(value)
+    except (TypeError, ValueError):
+        return []
+
+
+def encode_tag_columns(table):
+    """JSON-encode list tag columns, which CSV can't hold, as the enriched CSV stores them"""
+    for col in TAG_COLUMNS:
+        index = table.schema.get_field_index(col)
+        if index < 0 or not pa.types.is_list(table.schema.field(index).type):
+            continue
+        # Empty lists are written as '', like the enrichment's CSV export
+        encoded = [json.dumps(tags) if tags else '' for tags in table.column(index).to_pylist()]
+        table = table.set_column(index, col, pa.array(encoded, type=pa.string()))
+    return table